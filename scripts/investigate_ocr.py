@@ -7,16 +7,21 @@ Useful for understanding what data is available for visual alignment.
 Usage: uv run scripts/investigate_ocr.py <input.pdf>
 """
 
+import asyncio
 import json
 import os
 import sys
 import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 from mistralai import Mistral
 
-from pdf_to_english_py.ocr import encode_pdf_to_base64
+if TYPE_CHECKING:
+    from mistralai.models import OCRResponse
+
+from pdf_to_english_py.ocr import uploaded_pdf
 
 load_dotenv()
 
@@ -25,18 +30,19 @@ client = Mistral(api_key=os.environ["MISTRAL_API_KEY"])
 
 print(f"Processing: {input_path}")
 
-# Encode PDF and call OCR
-base64_pdf = encode_pdf_to_base64(input_path)
-
-ocr_response = client.ocr.process(
-    model="mistral-ocr-latest",
-    document={
-        "type": "document_url",
-        "document_url": f"data:application/pdf;base64,{base64_pdf}",
-    },
-    table_format="html",
-    include_image_base64=True,
-)
+
+async def run_ocr() -> OCRResponse:
+    """Upload the PDF and call OCR on it."""
+    async with uploaded_pdf(input_path, client) as document_url:
+        return await client.ocr.process_async(
+            model="mistral-ocr-latest",
+            document={"type": "document_url", "document_url": document_url},
+            table_format="html",
+            include_image_base64=True,
+        )
+
+
+ocr_response = asyncio.run(run_ocr())
 
 # Extract relevant data (excluding large base64 strings)
 output: dict[str, object] = {
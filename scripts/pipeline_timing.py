@@ -6,6 +6,7 @@ Usage: uv run python scripts/pipeline_timing.py <pdf_path>
 from __future__ import annotations
 
 import argparse
+import asyncio
 import os
 import sys
 import time
@@ -16,18 +17,12 @@ from dotenv import load_dotenv
 from mistralai import Mistral
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Awaitable, Callable
 
-    from mistralai.models import OCRResponse
+    from pdf_to_english_py.ocr import OcrResult
 
-from pdf_to_english_py.ocr import (
-    OcrPage,
-    encode_pdf_to_base64,
-    inline_images,
-    inline_tables,
-)
+from pdf_to_english_py.pipeline import ocr_and_translate
 from pdf_to_english_py.render import render_pdf
-from pdf_to_english_py.translate import translate_markdown
 
 load_dotenv()
 
@@ -52,9 +47,9 @@ def timed(
     def decorator(func: Callable[P, T]) -> Callable[P, tuple[T, float]]:
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> tuple[T, float]:
             print(f"\n⏱️  Starting: {name}")
-            start = time.time()
+            start = time.perf_counter_ns()
             result = func(*args, **kwargs)
-            elapsed = time.time() - start
+            elapsed = (time.perf_counter_ns() - start) / 1e9
             print(f"✅ Completed: {name} in {elapsed:.2f}s")
             return result, elapsed
 
@@ -63,58 +58,55 @@ def timed(
     return decorator
 
 
-@timed("1. Load PDF and encode to base64")
-def step_encode(pdf_path: Path) -> str:
-    """Load a PDF file and encode it to base64."""
-    return encode_pdf_to_base64(pdf_path)
+def timed_async(
+    name: str,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[tuple[T, float]]]]:
+    """Decorator to time a coroutine function and return (result, elapsed_seconds)."""
 
+    def decorator(
+        func: Callable[P, Awaitable[T]],
+    ) -> Callable[P, Awaitable[tuple[T, float]]]:
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> tuple[T, float]:
+            print(f"\n⏱️  Starting: {name}")
+            start = time.perf_counter_ns()
+            result = await func(*args, **kwargs)
+            elapsed = (time.perf_counter_ns() - start) / 1e9
+            print(f"✅ Completed: {name} in {elapsed:.2f}s")
+            return result, elapsed
 
-@timed("2. Mistral OCR API call")
-def step_ocr(base64_pdf: str, client: Mistral) -> OCRResponse:
-    """Call Mistral OCR API to extract text from PDF."""
-    return client.ocr.process(
-        model="mistral-ocr-latest",
-        document={
-            "type": "document_url",
-            "document_url": f"data:application/pdf;base64,{base64_pdf}",
-        },
-        table_format="html",
-        include_image_base64=True,
-    )
+        return wrapper
 
+    return decorator
 
-@timed("3. Process OCR response (inline tables/images)")
-def step_process(ocr_response: OCRResponse) -> str:
-    """Process OCR response by inlining tables and images into markdown."""
-    pages = []
-    for page in ocr_response.pages:
-        markdown = page.markdown
-        if page.tables:
-            tables_data = [{"id": t.id, "content": t.content} for t in page.tables]
-            markdown = inline_tables(markdown, tables_data)
-        if page.images:
-            images_data = [
-                {"id": img.id, "image_base64": img.image_base64} for img in page.images
-            ]
-            markdown = inline_images(markdown, images_data)
-        pages.append(OcrPage(index=page.index, markdown=markdown))
 
-    return "\n\n".join(p.markdown for p in pages)
+@timed_async("1-2. OCR and translation (overlapped)")
+async def step_ocr_translate(
+    pdf_path: Path, client: Mistral
+) -> tuple[OcrResult, str, float]:
+    """OCR each page and translate it as soon as its OCR completes.
 
+    Returns the OCR result, translated markdown, and seconds until OCR finished.
+    """
+    start = time.perf_counter_ns()
+    ocr_elapsed = 0.0
 
-@timed("4. Translation (Mistral Large)")
-def step_translate(markdown: str, client: Mistral) -> str:
-    """Translate markdown content using Mistral Large."""
-    return translate_markdown(markdown, client)
+    def record_ocr_done() -> None:
+        nonlocal ocr_elapsed
+        ocr_elapsed = (time.perf_counter_ns() - start) / 1e9
+
+    ocr_result, translated = await ocr_and_translate(
+        pdf_path, client, on_ocr_done=record_ocr_done
+    )
+    return ocr_result, translated, ocr_elapsed
 
 
-@timed("5. Render to PDF (WeasyPrint)")
+@timed("3. Render to PDF (WeasyPrint)")
 def step_render(markdown: str, output_path: Path) -> Path:
     """Render markdown to PDF using WeasyPrint."""
     return render_pdf(markdown, output_path)
 
 
-def main() -> None:
+async def main() -> None:
     """Run the full PDF processing pipeline with timing for each step."""
     pdf_path = args.pdf_path
     output_path = Path(f"output_pdfs/{pdf_path.stem}_timed.pdf")
@@ -123,31 +115,22 @@ def main() -> None:
     print(f"📄 Processing: {pdf_path}")
     print(f"📏 File size: {pdf_path.stat().st_size / 1024:.1f} KB")
 
-    client = Mistral(api_key=os.environ["MISTRAL_API_KEY"])
-
-    total_start = time.time()
+    total_start = time.perf_counter_ns()
     timings = {}
 
-    # Step 1: Encode
-    base64_pdf, timings["encode"] = step_encode(pdf_path)
-    print(f"   Base64 length: {len(base64_pdf):,} chars")
-
-    # Step 2: OCR
-    ocr_response, timings["ocr"] = step_ocr(base64_pdf, client)
-    print(f"   Pages: {len(ocr_response.pages)}")
-
-    # Step 3: Process
-    markdown, timings["process"] = step_process(ocr_response)
-    print(f"   Markdown length: {len(markdown):,} chars")
-
-    # Step 4: Translate
-    translated, timings["translate"] = step_translate(markdown, client)
-    print(f"   Translated length: {len(translated):,} chars")
+    async with Mistral(api_key=os.environ["MISTRAL_API_KEY"]) as client:
+        # Steps 1-2: OCR streams pages straight into translation
+        results, timings["ocr+translate"] = await step_ocr_translate(pdf_path, client)
+        ocr_result, translated, ocr_elapsed = results
+        print(f"   Pages: {len(ocr_result.pages)}")
+        print(f"   OCR finished after: {ocr_elapsed:.2f}s")
+        print(f"   Markdown length: {len(ocr_result.raw_markdown):,} chars")
+        print(f"   Translated length: {len(translated):,} chars")
 
-    # Step 5: Render
+    # Step 3: Render
     result_path, timings["render"] = step_render(translated, output_path)
 
-    total_elapsed = time.time() - total_start
+    total_elapsed = (time.perf_counter_ns() - total_start) / 1e9
 
     print("\n" + "=" * 50)
     print("📊 TIMING SUMMARY")
@@ -155,11 +138,11 @@ def main() -> None:
     for step, elapsed in timings.items():
         pct = (elapsed / total_elapsed) * 100
         bar = "█" * int(pct / 2)
-        print(f"{step:12} {elapsed:6.1f}s ({pct:4.1f}%) {bar}")
+        print(f"{step:13} {elapsed:6.1f}s ({pct:4.1f}%) {bar}")
     print("-" * 50)
-    print(f"{'TOTAL':12} {total_elapsed:6.1f}s")
+    print(f"{'TOTAL':13} {total_elapsed:6.1f}s")
     print(f"\n✅ Output: {result_path}")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
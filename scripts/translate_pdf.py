@@ -1,40 +1,91 @@
 #!/usr/bin/env python
-"""Translate a PDF to English.
+"""Translate PDFs to English.
 
-Usage: uv run scripts/translate_pdf.py <input.pdf>
+Usage: uv run scripts/translate_pdf.py <input.pdf> [<input.pdf> ...] [--batch]
 """
 
+import argparse
+import asyncio
+import itertools
 import os
-import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
 from mistralai import Mistral
 
-from pdf_to_english_py.ocr import extract_pdf
-from pdf_to_english_py.render import render_pdf
-from pdf_to_english_py.translate import translate_markdown
+from pdf_to_english_py.ocr import PAGE_SEPARATOR, extract_pdfs_batch
+from pdf_to_english_py.pipeline import ocr_and_translate
+from pdf_to_english_py.render import render_pdfs
+from pdf_to_english_py.translate import translate_markdown_batch
 
 load_dotenv()
 
-input_path = Path(sys.argv[1])
-output_dir = Path("output_pdfs")
-output_dir.mkdir(exist_ok=True)
-output_path = output_dir / f"{input_path.stem}_EN.pdf"
-client = Mistral(api_key=os.environ["MISTRAL_API_KEY"])
+parser = argparse.ArgumentParser(description="Translate PDFs to English")
+parser.add_argument(
+    "input_paths", type=Path, nargs="+", help="Paths to the PDF files to translate"
+)
+parser.add_argument(
+    "--batch",
+    action="store_true",
+    help="OCR and translate via the Mistral Batch API (half price, but queued)",
+)
 
-print("Extracting...")
-ocr_result = extract_pdf(input_path, client)
 
-print("Translating...")
-translated_md = translate_markdown(ocr_result.raw_markdown, client)
+async def main() -> None:
+    """Run OCR → translate → render for each input PDF."""
+    args = parser.parse_args()
+    output_dir = Path("output_pdfs")
+    output_dir.mkdir(exist_ok=True)
+
+    async with Mistral(api_key=os.environ["MISTRAL_API_KEY"]) as client:
+        if args.batch:
+            print("Extracting (batch job)...")
+            ocr_results = await extract_pdfs_batch(args.input_paths, client)
+            print("Translating (batch job)...")
+            # Every document's pages go into one job, then are split back out
+            page_counts = [len(ocr_result.pages) for ocr_result in ocr_results]
+            translated_pages = iter(
+                await translate_markdown_batch(
+                    [
+                        page.markdown
+                        for ocr_result in ocr_results
+                        for page in ocr_result.pages
+                    ],
+                    client,
+                )
+            )
+            translations = [
+                PAGE_SEPARATOR.join(itertools.islice(translated_pages, page_count))
+                for page_count in page_counts
+            ]
+        else:
+            print("Extracting and translating...")
+            results = [
+                await ocr_and_translate(input_path, client)
+                for input_path in args.input_paths
+            ]
+            ocr_results = [ocr_result for ocr_result, _ in results]
+            translations = [translated for _, translated in results]
+
+    print("Rendering...")
+    for output_path in render_pdfs(
+        [
+            (
+                translated_markdown,
+                output_dir / f"{input_path.stem}_EN.pdf",
+                ocr_result.images,
+                ocr_result.page_dimensions,
+            )
+            for input_path, ocr_result, translated_markdown in zip(
+                args.input_paths, ocr_results, translations, strict=True
+            )
+        ]
+    ):
+        print(f"  {output_path}")
+
+    print("Done")
 
-print("Rendering...")
-render_pdf(
-    translated_md,
-    output_path,
-    images=ocr_result.images,
-    page_dimensions=ocr_result.page_dimensions,
-)
 
-print(f"Done: {output_path}")
+# Guarded so render worker processes importing this module do not rerun it
+if __name__ == "__main__":
+    asyncio.run(main())
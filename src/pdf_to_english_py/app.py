@@ -1,13 +1,16 @@
 """Gradio web application for PDF translation."""
 
+import asyncio
 import os
 import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import gradio as gr
 from dotenv import load_dotenv
 
-from pdf_to_english_py.ocr import extract_pdf
+from pdf_to_english_py.cache import purge_cache
+from pdf_to_english_py.pipeline import ocr_and_translate
 from pdf_to_english_py.render import render_pdf
 from pdf_to_english_py.theme import (
     ALL_CSS,
@@ -15,15 +18,24 @@ from pdf_to_english_py.theme import (
     FORCE_DARK_HEAD,
     pipeline_html,
 )
-from pdf_to_english_py.translate import translate_markdown
 from pdf_to_english_py.validate import (
+    get_client,
     validate_api_key_format,
     validate_api_key_with_mistral,
+    validate_pdf,
 )
 
+if TYPE_CHECKING:
+    from mistralai import Mistral
+
+    from pdf_to_english_py.ocr import OcrResult
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Seconds uploads, outputs, and cached OCR and translation results are kept
+RETENTION_SECONDS = 3600
+
 
 def api_key_default(railway_env: str | None, api_key: str | None) -> str:
     """Return API key default for the UI: empty when deployed, key value locally."""
@@ -50,6 +62,16 @@ def _step_error(step: str, done: set[str], msg: str) -> tuple[object, ...]:
     )
 
 
+def _key_error(msg: str) -> tuple[object, ...]:
+    """Return a yield tuple that hides the pipeline and shows an API key error."""
+    return (
+        gr.skip(),
+        gr.HTML(visible=False),
+        _hide_error(),
+        gr.Markdown(msg, visible=True),
+    )
+
+
 def _step_active(
     step: str, done: set[str], *, clear_file: bool = False
 ) -> tuple[object, ...]:
@@ -65,11 +87,58 @@ def _step_active(
     )
 
 
-def _handle_translate(  # noqa: ANN202
+async def _key_rejection(
+    validation: asyncio.Task[tuple[bool | None, str, Mistral | None]],
+) -> str:
+    """Return the error message once Mistral rejects the API key.
+
+    Never returns for a key that passes, or that could not be checked, so it
+    can be waited on alongside the pipeline to stop it early.
+    """
+    is_valid, error_msg, _ = await validation
+    if is_valid is False:
+        return error_msg
+    # Wait until cancelled with the request
+    never: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+    return await never
+
+
+async def _pipeline_error(
+    error: Exception,
+    validation: asyncio.Task[tuple[bool | None, str, Mistral | None]],
+    ocr_done: asyncio.Event,
+) -> tuple[object, ...]:
+    """Return a yield tuple reporting a pipeline failure against its cause."""
+    # A rejected key fails the first API call; report the key, not the step
+    is_valid, error_msg, _ = await validation
+    if is_valid is False:
+        return _key_error(error_msg)
+    # Translation errors only surface once every page is OCR'd
+    if not ocr_done.is_set():
+        return _step_error("ocr", set(), f"OCR failed: {error}")
+    return _step_error("translate", {"ocr"}, f"Translation failed: {error}")
+
+
+async def _wait_for_ocr(
+    pipeline: asyncio.Task[object],
+    ocr_done: asyncio.Event,
+    rejection: asyncio.Task[str],
+) -> None:
+    """Wait until every page has been OCR'd, or the pipeline or key ends first."""
+    ocr_wait = asyncio.ensure_future(ocr_done.wait())
+    try:
+        await asyncio.wait(
+            {pipeline, ocr_wait, rejection}, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        ocr_wait.cancel()
+
+
+async def _handle_translate(  # noqa: ANN202
     pdf_file: str | None,
     api_key: str,
 ):  # Return type omitted — Gradio evaluates annotations at runtime
-    """Generator handler that drives the OCR → translate → render pipeline.
+    """Async generator handler that drives the OCR → translate → render pipeline.
 
     Yields pipeline status updates as it processes the uploaded PDF
     with the user-provided API key.
@@ -91,62 +160,98 @@ def _handle_translate(  # noqa: ANN202
         )
         return
 
-    # Network validation (format already checked above)
-    is_valid, error_msg, client = validate_api_key_with_mistral(api_key)
-    if not is_valid or client is None:
+    # Preflight the PDF locally before spending time on upload and OCR; parsing
+    # a large PDF is blocking work, so keep it off the event loop
+    input_path = Path(pdf_file)
+    pdf_ok, pdf_error_msg, page_count = await asyncio.to_thread(
+        validate_pdf, input_path
+    )
+    if not pdf_ok:
         yield (
             gr.skip(),
             gr.skip(),
+            gr.Markdown(pdf_error_msg, visible=True),
             _no_error,
-            gr.Markdown(error_msg, visible=True),
         )
         return
 
-    input_path = Path(pdf_file)
     output_dir = Path(tempfile.gettempdir())
 
-    # Step 1: OCR
-    yield _step_active("ocr", set(), clear_file=True)
-    try:
-        ocr_result = extract_pdf(input_path, client)
-    except Exception as e:  # noqa: BLE001
-        yield _step_error("ocr", set(), f"OCR failed: {e}")
-        return
-
-    # Step 2: Translation
-    yield _step_active("translate", {"ocr"})
-    try:
-        translated_markdown = translate_markdown(ocr_result.raw_markdown, client)
-    except Exception as e:  # noqa: BLE001
-        yield _step_error("translate", {"ocr"}, f"Translation failed: {e}")
-        return
+    # Users' documents must not outlive their uploads in the shared disk cache
+    await asyncio.to_thread(purge_cache, RETENTION_SECONDS)
 
-    # Step 3: Render PDF
-    yield _step_active("render", {"ocr", "translate"})
+    # Network validation runs alongside the upload and OCR rather than before;
+    # the pipeline is cancelled as soon as Mistral rejects the key
+    client = get_client(api_key)
+    validation = asyncio.create_task(validate_api_key_with_mistral(api_key))
+    rejection = asyncio.create_task(_key_rejection(validation))
+    pipeline: asyncio.Task[tuple[OcrResult, str]] | None = None
     try:
-        output_filename = f"{input_path.stem}_english.pdf"
-        output_path = output_dir / output_filename
-        render_pdf(
-            translated_markdown,
-            output_path,
-            images=ocr_result.images,
-            page_dimensions=ocr_result.page_dimensions,
+        # Steps 1-2: OCR pages stream straight into translation as they complete
+        yield _step_active("ocr", set(), clear_file=True)
+        ocr_done = asyncio.Event()
+        pipeline = asyncio.create_task(
+            ocr_and_translate(
+                input_path, client, page_count=page_count, on_ocr_done=ocr_done.set
+            )
         )
-    except Exception as e:  # noqa: BLE001
-        yield _step_error(
-            "render",
-            {"ocr", "translate"},
-            f"PDF rendering failed: {e}",
+        try:
+            await _wait_for_ocr(pipeline, ocr_done, rejection)
+            if not pipeline.done() and not rejection.done():
+                yield _step_active("translate", {"ocr"})
+                await asyncio.wait(
+                    {pipeline, rejection}, return_when=asyncio.FIRST_COMPLETED
+                )
+            if rejection.done():
+                pipeline.cancel()
+                yield _key_error(rejection.result())
+                return
+            ocr_result, translated_markdown = await pipeline
+        except Exception as e:  # noqa: BLE001
+            yield await _pipeline_error(e, validation, ocr_done)
+            return
+
+        # A fully cached PDF makes no API call, so only validation vets the key.
+        # A check that could not reach Mistral keeps the finished result.
+        is_valid, error_msg, _ = await validation
+        if is_valid is False:
+            yield _key_error(error_msg)
+            return
+
+        # Step 3: Render PDF
+        yield _step_active("render", {"ocr", "translate"})
+        try:
+            output_filename = f"{input_path.stem}_english.pdf"
+            output_path = output_dir / output_filename
+            # WeasyPrint is CPU-bound; run it off the event loop
+            await asyncio.to_thread(
+                render_pdf,
+                translated_markdown,
+                output_path,
+                images=ocr_result.images,
+                page_dimensions=ocr_result.page_dimensions,
+            )
+        except Exception as e:  # noqa: BLE001
+            yield _step_error(
+                "render",
+                {"ocr", "translate"},
+                f"PDF rendering failed: {e}",
+            )
+            return
+
+        # Complete
+        yield (
+            str(output_path),
+            gr.HTML(value=pipeline_html(complete=True), visible=True),
+            _no_error,
+            _no_error,
         )
-        return
-
-    # Complete
-    yield (
-        str(output_path),
-        gr.HTML(value=pipeline_html(complete=True), visible=True),
-        _no_error,
-        _no_error,
-    )
+    finally:
+        # Never leave work running past the request (e.g. a closed browser tab)
+        validation.cancel()
+        rejection.cancel()
+        if pipeline is not None:
+            pipeline.cancel()
 
 
 def create_app() -> gr.Blocks:
@@ -156,7 +261,10 @@ def create_app() -> gr.Blocks:
         Configured Gradio Blocks application.
     """
     # Purge cached uploads and outputs older than 1 hour (checked hourly)
-    with gr.Blocks(title="PDF To English", delete_cache=(3600, 3600)) as demo:
+    with gr.Blocks(
+        title="PDF To English",
+        delete_cache=(RETENTION_SECONDS, RETENTION_SECONDS),
+    ) as demo:
         gr.Markdown("<br>")
         gr.Markdown("# PDF To English")
         gr.Markdown("Upload a PDF, get English.")
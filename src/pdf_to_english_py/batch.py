@@ -0,0 +1,76 @@
+"""Mistral Batch API jobs shared by the OCR and translation batch paths."""
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mistralai import Mistral
+    from mistralai.models import APIEndpoint, BatchRequestTypedDict
+
+# Seconds between batch job status checks
+BATCH_POLL_INTERVAL = 10.0
+
+# Batch job states after which the job will make no further progress
+_BATCH_FINAL_STATUSES = frozenset(
+    {"SUCCESS", "FAILED", "TIMEOUT_EXCEEDED", "CANCELLED"}
+)
+
+
+def parse_batch_bodies(output: str) -> dict[str, Any]:
+    """Parse a Mistral batch output file into response bodies by custom_id.
+
+    Args:
+        output: JSONL text of the batch output file, one result per line.
+
+    Returns:
+        Dict mapping each request's custom_id to its decoded response body.
+    """
+    bodies: dict[str, Any] = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        bodies[record["custom_id"]] = record["response"]["body"]
+    return bodies
+
+
+async def run_batch_job(
+    client: Mistral,
+    *,
+    endpoint: APIEndpoint,
+    model: str,
+    requests: list[BatchRequestTypedDict],
+    poll_interval: float = BATCH_POLL_INTERVAL,
+) -> dict[str, Any]:
+    """Submit requests as one batch job and wait for its results.
+
+    Batch inference costs half as much as regular requests but is queued, so it
+    suits non-interactive runs rather than the web app.
+
+    Args:
+        client: Mistral API client.
+        endpoint: API endpoint every request in the job targets.
+        model: Model to run the requests with.
+        requests: Inline requests, each with a custom_id and request body.
+        poll_interval: Seconds to wait between job status checks.
+
+    Returns:
+        Dict mapping each request's custom_id to its decoded response body.
+
+    Raises:
+        RuntimeError: If the batch job does not complete successfully.
+    """
+    job = await client.batch.jobs.create_async(
+        endpoint=endpoint, model=model, requests=requests
+    )
+    while job.status not in _BATCH_FINAL_STATUSES:
+        await asyncio.sleep(poll_interval)
+        job = await client.batch.jobs.get_async(job_id=job.id)
+
+    if job.status != "SUCCESS" or not job.output_file:
+        msg = f"Batch job {job.id} finished with status {job.status}"
+        raise RuntimeError(msg)
+
+    response = await client.files.download_async(file_id=job.output_file)
+    return parse_batch_bodies((await response.aread()).decode("utf-8"))
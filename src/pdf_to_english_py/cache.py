@@ -0,0 +1,122 @@
+"""Persistent disk cache for expensive, deterministic Mistral API results."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+CACHE_DIR = (
+    Path(os.environ.get("PDF2EN_CACHE_DIR", "~/.cache/pdf_to_english_py"))
+    .expanduser()
+    .absolute()
+)
+
+# Decoded OCR images, referenced from cached page markdown by file:// URI
+IMAGE_DIR = CACHE_DIR / "images"
+
+
+def cache_key(*parts: str | bytes) -> str:
+    """Hash the given parts into a cache key.
+
+    Each part is length-prefixed so that ("ab", "c") and ("a", "bc") differ.
+
+    Args:
+        parts: Strings or bytes that together identify a cached value.
+
+    Returns:
+        128-bit BLAKE2b hex digest of the parts.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """Hash a file's contents without reading it into memory at once.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        128-bit BLAKE2b hex digest of the file contents.
+    """
+    with path.open("rb") as file:
+        return hashlib.file_digest(
+            file, lambda: hashlib.blake2b(digest_size=16)
+        ).hexdigest()
+
+
+def read_cache(key: str, cache_dir: Path = CACHE_DIR) -> object | None:
+    """Return the cached value for key, or None on a miss.
+
+    Unreadable cache entries, including truncated pickles and pickles of
+    classes that have since been renamed, moved, or changed, are treated as
+    misses.
+
+    Args:
+        key: Cache key, typically from cache_key().
+        cache_dir: Directory holding cache entries.
+
+    Returns:
+        The cached value, or None if nothing usable is stored under key.
+    """
+    try:
+        with (cache_dir / f"{key}.pickle").open("rb") as cached:
+            return pickle.load(cached)  # noqa: S301 - only reads entries we wrote
+    # A damaged or stale pickle can fail with almost any exception (ValueError,
+    # TypeError, IndexError, ...), and any of them only means a miss
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def write_cache(key: str, value: object, cache_dir: Path = CACHE_DIR) -> None:
+    """Store a value under key, atomically so readers never see a partial file.
+
+    Args:
+        key: Cache key, typically from cache_key().
+        value: Picklable value to store.
+        cache_dir: Directory holding cache entries.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as tmp:
+        try:
+            pickle.dump(value, tmp)
+            tmp.close()
+            Path(tmp.name).replace(cache_dir / f"{key}.pickle")
+        except BaseException:
+            # Never leave a partial temporary file behind in the cache
+            tmp.close()
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+
+
+def purge_cache(max_age: float, cache_dir: Path = CACHE_DIR) -> int:
+    """Delete cache entries and saved images not written for max_age seconds.
+
+    Entries age from when they were written, not last read. save_image()
+    rewrites the timestamp of an image it saves again, so an image is never
+    purged before a cached page that references it.
+
+    Args:
+        max_age: Seconds since its last write after which a file is deleted.
+        cache_dir: Directory holding cache entries, and images under "images".
+
+    Returns:
+        Number of files deleted.
+    """
+    cutoff = time.time() - max_age
+    deleted = 0
+    for path in cache_dir.rglob("*"):
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                deleted += 1
+        except FileNotFoundError:
+            # Deleted or replaced by a concurrent purge or write
+            continue
+    return deleted
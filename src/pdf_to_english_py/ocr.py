@@ -1,17 +1,48 @@
 """OCR extraction module using Mistral OCR 3."""
 
+import asyncio
 import base64
+import os
 import re
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import PurePath
 from typing import TYPE_CHECKING, Any
 
+from mistralai.models import OCRResponse
+from pypdf import PdfReader
+
+from pdf_to_english_py.batch import BATCH_POLL_INTERVAL, run_batch_job
+from pdf_to_english_py.cache import (
+    IMAGE_DIR,
+    cache_key,
+    file_hash,
+    read_cache,
+    write_cache,
+)
+
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
     from pathlib import Path
 
     from mistralai import Mistral
+    from mistralai.models import OCRPageObject
 
+OCR_MODEL = "mistral-ocr-latest"
 
-@dataclass
+# Cap on in-flight per-page OCR requests, to stay within Mistral rate limits
+MAX_CONCURRENT_OCR_PAGES = 4
+
+# Horizontal rule separating pages in combined markdown
+PAGE_SEPARATOR = "\n\n---\n\n"
+
+# Bumped whenever cached OcrPage objects (or the dataclasses they hold) change
+# layout, so pages pickled by an older version are not misread
+_PAGE_CACHE_VERSION = "3"
+
+
+@dataclass(slots=True, frozen=True)
 class PageDimensions:
     """Page dimensions in millimetres, calculated from OCR pixel data."""
 
@@ -27,7 +58,7 @@ class PageDimensions:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImageMetadata:
     """Metadata for an image extracted from OCR, including sizing info."""
 
@@ -64,6 +95,8 @@ class OcrPage:
 
     index: int
     markdown: str  # Markdown with tables/images inlined
+    images: list[ImageMetadata] = field(default_factory=list)
+    dimensions: PageDimensions | None = None
 
 
 @dataclass
@@ -71,10 +104,34 @@ class OcrResult:
     """Complete OCR result for a document."""
 
     pages: list[OcrPage]
-    raw_markdown: str  # Combined markdown from all pages
     images: list[ImageMetadata] = field(default_factory=list)
     page_dimensions: PageDimensions | None = None
 
+    @cached_property
+    def raw_markdown(self) -> str:
+        """Combined markdown from all pages, built only if something reads it."""
+        return combine_pages(self.pages)
+
+    @classmethod
+    def from_pages(cls, pages: list[OcrPage]) -> OcrResult:
+        """Assemble a document result from its pages, in any order.
+
+        Args:
+            pages: OCR pages of the document.
+
+        Returns:
+            OcrResult with pages sorted by index, their images, and the
+            dimensions of the first page that has them.
+        """
+        pages = sorted(pages, key=lambda page: page.index)
+        return cls(
+            pages=pages,
+            images=[image for page in pages for image in page.images],
+            page_dimensions=next(
+                (page.dimensions for page in pages if page.dimensions), None
+            ),
+        )
+
 
 def combine_pages(pages: list[OcrPage]) -> str:
     """Combine OCR pages into single markdown with horizontal rule separators.
@@ -85,23 +142,18 @@ def combine_pages(pages: list[OcrPage]) -> str:
     Returns:
         Combined markdown with --- separators between pages.
     """
-    return "\n\n---\n\n".join(page.markdown for page in pages)
+    return PAGE_SEPARATOR.join([page.markdown for page in pages])
 
 
-def encode_pdf_to_base64(pdf_path: Path) -> str:
-    """Encode a local PDF file to base64 string.
+def _replace_all(text: str, replacements: dict[str, str]) -> str:
+    """Replace every occurrence of each key in a single pass over text.
 
-    Args:
-        pdf_path: Path to the PDF file.
-
-    Returns:
-        Base64-encoded string of the PDF content.
-
-    Raises:
-        FileNotFoundError: If the PDF file doesn't exist.
+    Inserted values are not rescanned, so they may safely contain keys.
     """
-    with pdf_path.open("rb") as pdf_file:
-        return base64.b64encode(pdf_file.read()).decode("utf-8")
+    if not replacements:
+        return text
+    pattern = re.compile("|".join(map(re.escape, replacements)))
+    return pattern.sub(lambda match: replacements[match.group(0)], text)
 
 
 def inline_tables(markdown: str, tables: list[dict[str, Any]]) -> str:
@@ -117,47 +169,233 @@ def inline_tables(markdown: str, tables: list[dict[str, Any]]) -> str:
     Returns:
         Markdown with table placeholders replaced by actual HTML.
     """
-    result = markdown
+    # Link-style placeholders: [tbl-N.html](tbl-N.html)
+    replacements: dict[str, str] = {}
     for table in tables:
         table_id = table.get("id", "")
-        table_content = table.get("content", "")
-        # Replace the link-style placeholder: [tbl-N.html](tbl-N.html)
-        placeholder = f"[{table_id}]({table_id})"
-        result = result.replace(placeholder, table_content)
-    return result
+        replacements.setdefault(f"[{table_id}]({table_id})", table.get("content", ""))
+    return _replace_all(markdown, replacements)
 
 
 def inline_images(markdown: str, images: list[dict[str, Any]]) -> str:
-    """Replace image placeholders with base64 data URIs.
+    """Replace image placeholders with image URIs.
 
     Replaces patterns like ![img-0.jpeg](img-0.jpeg) with
-    ![img-0.jpeg](data:image/jpeg;base64,...).
+    ![img-0.jpeg](data:image/jpeg;base64,...) or ![img-0.jpeg](file:///...).
 
     Args:
         markdown: Markdown with image placeholders.
-        images: List of image objects with 'id' and 'image_base64' fields.
+        images: List of image objects with 'id' and 'image_base64' fields, the
+            latter holding a data URI or a file URI from save_image(), and an
+            optional 'alt' field giving the alt text (the 'id' if absent).
 
     Returns:
-        Markdown with image placeholders replaced by base64 data URIs.
+        Markdown with image placeholders replaced by image URIs.
     """
-    result = markdown
+    # Image-style placeholders: ![img-N.jpeg](img-N.jpeg)
+    replacements: dict[str, str] = {}
     for image in images:
         image_id = image.get("id", "")
-        image_base64 = image.get("image_base64", "")
-        # Replace the image-style placeholder: ![img-N.jpeg](img-N.jpeg)
-        # Need to escape special regex characters in the image_id
-        escaped_id = re.escape(image_id)
-        pattern = rf"!\[{escaped_id}\]\({escaped_id}\)"
-        replacement = f"![{image_id}]({image_base64})"
-        result = re.sub(pattern, replacement, result)
-    return result
+        replacements.setdefault(
+            f"![{image_id}]({image_id})",
+            f"![{image.get('alt', image_id)}]({image.get('image_base64', '')})",
+        )
+    return _replace_all(markdown, replacements)
+
+
+def page_image_id(index: int, image_id: str) -> str:
+    """Qualify an OCR image ID with its page, making it unique in the document.
+
+    Each page is OCR'd in its own request, so image IDs restart on every page.
+    The qualified ID keeps the original file extension.
+
+    Args:
+        index: Index of the page within the document.
+        image_id: OCR image ID (e.g. "img-0.jpeg").
+
+    Returns:
+        Page-qualified image ID (e.g. "page-2-img-0.jpeg").
+    """
+    return f"page-{index}-{image_id}"
+
+
+def save_image(data_uri: str, image_id: str, image_dir: Path = IMAGE_DIR) -> str:
+    """Decode a base64 image data URI to a file and return its file URI.
+
+    Files are named by content hash, so identical images (logos, repeated
+    figures) share one file; saving one again refreshes its modification time,
+    so purge_cache() keeps it as long as the newest page referencing it.
+    Keeping images on disk rather than inlined lets OCR pages be cached and
+    translated without carrying megabytes of base64; WeasyPrint reads the
+    files only when rendering.
+
+    Args:
+        data_uri: Image as a base64 data URI (or bare base64) from Mistral OCR.
+        image_id: OCR image ID (e.g. "img-0.jpeg"), used for the file extension.
+        image_dir: Directory to write the image into.
+
+    Returns:
+        file:// URI of the decoded image.
+    """
+    data = base64.b64decode(data_uri.rpartition(",")[2])
+    path = image_dir / f"{cache_key(data)}{PurePath(image_id).suffix}"
+    try:
+        # Refresh an existing image's age rather than writing it again
+        os.utime(path)
+    except FileNotFoundError:
+        image_dir.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return path.as_uri()
+
+
+@asynccontextmanager
+async def uploaded_pdf(pdf_path: Path, client: Mistral) -> AsyncIterator[str]:
+    """Upload a PDF to the Mistral Files API for the duration of a block.
+
+    The raw file is streamed to Mistral, avoiding the 33% size overhead of
+    base64 and the giant data URL in the OCR request body. The uploaded file
+    is deleted when the block exits.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        client: Mistral API client.
+
+    Yields:
+        Signed URL that the OCR endpoint can fetch the document from.
+    """
+    with pdf_path.open("rb") as pdf_file:
+        uploaded = await client.files.upload_async(
+            file={"file_name": pdf_path.name, "content": pdf_file},
+            purpose="ocr",
+        )
+    try:
+        signed_url = await client.files.get_signed_url_async(file_id=uploaded.id)
+        yield signed_url.url
+    finally:
+        await client.files.delete_async(file_id=uploaded.id)
 
 
-def extract_pdf(pdf_path: Path, client: Mistral) -> OcrResult:
+def count_pages(pdf_path: Path) -> int:
+    """Count the pages in a PDF without sending it anywhere.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        Number of pages in the document.
+    """
+    return len(PdfReader(pdf_path).pages)
+
+
+def _page_cache_keys(pdf_path: Path, page_count: int | None = None) -> list[str]:
+    """Cache keys for each page's OCR result, by PDF content hash and index.
+
+    The PDF is only parsed to count its pages if page_count is not given.
+    """
+    digest = file_hash(pdf_path)
+    if page_count is None:
+        page_count = count_pages(pdf_path)
+    return [
+        cache_key("ocr-page", _PAGE_CACHE_VERSION, OCR_MODEL, digest, str(index))
+        for index in range(page_count)
+    ]
+
+
+def _process_and_cache_page(page: OCRPageObject, index: int, key: str) -> OcrPage:
+    """Process an OCR response page as by process_ocr_page() and cache it."""
+    processed = process_ocr_page(page, index)
+    write_cache(key, processed)
+    return processed
+
+
+def _read_cached_pages(keys: list[str]) -> list[OcrPage] | None:
+    """Return every cached page for the keys, or None if any is missing."""
+    pages: list[OcrPage] = []
+    for key in keys:
+        cached = read_cache(key)
+        if not isinstance(cached, OcrPage):
+            return None
+        pages.append(cached)
+    return pages
+
+
+async def stream_pdf_pages(
+    pdf_path: Path,
+    client: Mistral,
+    max_concurrency: int = MAX_CONCURRENT_OCR_PAGES,
+    page_count: int | None = None,
+) -> AsyncIterator[OcrPage]:
+    """Extract PDF pages with Mistral OCR 3, yielding each page as it completes.
+
+    Each page is OCR'd in its own request against a single upload, so callers
+    can start work on early pages while later ones are still being processed.
+    Pages are cached on disk by PDF content hash and page index; the PDF is
+    only uploaded if some page is not cached.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        client: Mistral API client.
+        max_concurrency: Maximum number of OCR requests in flight.
+        page_count: Number of pages in the PDF, if already known (for instance
+            from validate_pdf()); otherwise the PDF is parsed to count them.
+
+    Yields:
+        OcrPage for each page with tables and images inlined, in completion
+        order rather than page order.
+    """
+    # Hashing and parsing a large PDF, and reading and unpickling cached pages
+    # with their images, are blocking work; keep them off the event loop
+    keys = await asyncio.to_thread(_page_cache_keys, pdf_path, page_count)
+    misses: list[tuple[int, str]] = []
+    for index, key in enumerate(keys):
+        cached = await asyncio.to_thread(read_cache, key)
+        if isinstance(cached, OcrPage):
+            yield cached
+        else:
+            misses.append((index, key))
+
+    if not misses:
+        return
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def ocr_page(index: int, key: str, document_url: str) -> OcrPage:
+        async with semaphore:
+            ocr_response = await client.ocr.process_async(
+                model=OCR_MODEL,
+                document={"type": "document_url", "document_url": document_url},
+                pages=[index],
+                table_format="html",
+                include_image_base64=True,
+            )
+        # Decoding and saving images, and caching the page, is blocking work;
+        # keep it off the event loop
+        return await asyncio.to_thread(
+            _process_and_cache_page, ocr_response.pages[0], index, key
+        )
+
+    async with uploaded_pdf(pdf_path, client) as document_url:
+        tasks = [
+            asyncio.create_task(ocr_page(index, key, document_url))
+            for index, key in misses
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def extract_pdf(pdf_path: Path, client: Mistral) -> OcrResult:
     """Extract text, tables, and images from a PDF using Mistral OCR 3.
 
-    Uses table_format="html" and include_image_base64=True.
-    Automatically inlines tables and images into the markdown.
+    Uploads the PDF via the Files API, then uses table_format="html" and
+    include_image_base64=True. Automatically inlines tables and images into
+    the markdown.
+
+    Pages are cached on disk by PDF content hash, so re-uploading the same
+    PDF skips the OCR calls entirely.
 
     Args:
         pdf_path: Path to the PDF file.
@@ -166,69 +404,155 @@ def extract_pdf(pdf_path: Path, client: Mistral) -> OcrResult:
     Returns:
         OcrResult with inlined markdown content.
     """
-    # Encode PDF to base64 for upload
-    base64_pdf = encode_pdf_to_base64(pdf_path)
-
-    # Call Mistral OCR
-    ocr_response = client.ocr.process(
-        model="mistral-ocr-latest",
-        document={
-            "type": "document_url",
-            "document_url": f"data:application/pdf;base64,{base64_pdf}",
-        },
-        table_format="html",
-        include_image_base64=True,
+    return OcrResult.from_pages(
+        [page async for page in stream_pdf_pages(pdf_path, client)]
     )
 
-    # Process each page
-    pages: list[OcrPage] = []
-    all_images: list[ImageMetadata] = []
-    page_dimensions: PageDimensions | None = None
 
-    for page in ocr_response.pages:
-        # Capture page dimensions from first page
-        if page_dimensions is None and page.dimensions:
-            page_dimensions = PageDimensions.from_ocr(
-                width_px=page.dimensions.width,
-                height_px=page.dimensions.height,
-                dpi=page.dimensions.dpi,
+async def extract_pdfs_batch(
+    pdf_paths: list[Path],
+    client: Mistral,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+) -> list[OcrResult]:
+    """Extract several PDFs with a single Mistral OCR batch job.
+
+    Half the price of extract_pdf() but queued, so for non-interactive runs
+    over many documents. Uncached PDFs are uploaded concurrently and OCR'd in
+    one job; their pages are cached just as extract_pdf() caches them.
+
+    Args:
+        pdf_paths: Paths to the PDF files.
+        client: Mistral API client.
+        poll_interval: Seconds to wait between job status checks.
+
+    Returns:
+        OcrResult for each PDF, in the same order as the input.
+
+    Raises:
+        RuntimeError: If the batch job fails, or returns no result or the wrong
+            number of pages for a PDF.
+    """
+    page_keys = await asyncio.gather(
+        *(asyncio.to_thread(_page_cache_keys, pdf_path) for pdf_path in pdf_paths)
+    )
+    cached = await asyncio.gather(
+        *(asyncio.to_thread(_read_cached_pages, keys) for keys in page_keys)
+    )
+    misses = [index for index, pages in enumerate(cached) if pages is None]
+
+    fresh: dict[int, list[OcrPage]] = {}
+    if misses:
+        async with AsyncExitStack() as uploads:
+            document_urls = await asyncio.gather(
+                *(
+                    uploads.enter_async_context(uploaded_pdf(pdf_paths[index], client))
+                    for index in misses
+                )
             )
-        # Start with the raw markdown
-        markdown = page.markdown
-
-        # Inline tables if present
-        if page.tables:
-            tables_data = [{"id": t.id, "content": t.content} for t in page.tables]
-            markdown = inline_tables(markdown, tables_data)
-
-        # Inline images if present and capture metadata
-        if page.images:
-            images_data = [
-                {"id": img.id, "image_base64": img.image_base64} for img in page.images
-            ]
-            markdown = inline_images(markdown, images_data)
-
-            # Capture image metadata from bounding boxes (requires page dimensions)
-            if page.dimensions:
-                for img in page.images:
-                    if img.top_left_x is None or img.bottom_right_x is None:
-                        continue
-                    metadata = ImageMetadata.from_bounding_box(
-                        image_id=img.id,
-                        top_left_x=img.top_left_x,
-                        bottom_right_x=img.bottom_right_x,
-                        dpi=page.dimensions.dpi,
+            bodies = await run_batch_job(
+                client,
+                endpoint="/v1/ocr",
+                model=OCR_MODEL,
+                requests=[
+                    {
+                        "custom_id": str(index),
+                        "body": {
+                            "document": {"type": "document_url", "document_url": url},
+                            "table_format": "html",
+                            "include_image_base64": True,
+                        },
+                    }
+                    for index, url in zip(misses, document_urls, strict=True)
+                ],
+                poll_interval=poll_interval,
+            )
+
+        for index in misses:
+            if str(index) not in bodies:
+                msg = f"Batch OCR returned no result for {pdf_paths[index]}"
+                raise RuntimeError(msg)
+            ocr_response = OCRResponse.model_validate(bodies[str(index)])
+            page_indices = sorted(page.index for page in ocr_response.pages)
+            if page_indices != list(range(len(page_keys[index]))):
+                msg = (
+                    f"Batch OCR returned {len(page_indices)} pages for"
+                    f" {pdf_paths[index]}, which has {len(page_keys[index])}"
+                )
+                raise RuntimeError(msg)
+            fresh[index] = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        _process_and_cache_page,
+                        page,
+                        page.index,
+                        page_keys[index][page.index],
                     )
-                    all_images.append(metadata)
+                    for page in ocr_response.pages
+                )
+            )
 
-        pages.append(OcrPage(index=page.index, markdown=markdown))
+    return [
+        OcrResult.from_pages(pages if pages is not None else fresh[index])
+        for index, pages in enumerate(cached)
+    ]
 
-    # Combine all pages into raw_markdown with separators
-    raw_markdown = combine_pages(pages)
 
-    return OcrResult(
-        pages=pages,
-        raw_markdown=raw_markdown,
-        images=all_images,
-        page_dimensions=page_dimensions,
-    )
+def process_ocr_page(
+    page: OCRPageObject, index: int, image_dir: Path = IMAGE_DIR
+) -> OcrPage:
+    """Inline a Mistral OCR page's tables and images and capture its metadata.
+
+    Args:
+        page: Page object from a Mistral OCR response.
+        index: Index of the page within the document.
+        image_dir: Directory to save the page's images into.
+
+    Returns:
+        OcrPage with inlined markdown, image metadata, and page dimensions.
+    """
+    # Start with the raw markdown
+    markdown = page.markdown
+
+    # Inline tables if present
+    if page.tables:
+        tables_data = [{"id": t.id, "content": t.content} for t in page.tables]
+        markdown = inline_tables(markdown, tables_data)
+
+    images: list[ImageMetadata] = []
+    dimensions: PageDimensions | None = None
+    if page.dimensions:
+        dimensions = PageDimensions.from_ocr(
+            width_px=page.dimensions.width,
+            height_px=page.dimensions.height,
+            dpi=page.dimensions.dpi,
+        )
+
+    # Inline images if present and capture metadata; images are matched to
+    # their metadata by alt text, so both use the page-qualified ID
+    if page.images:
+        images_data = [
+            {
+                "id": img.id,
+                "alt": page_image_id(index, img.id),
+                "image_base64": save_image(img.image_base64, img.id, image_dir),
+            }
+            for img in page.images
+            if img.image_base64
+        ]
+        markdown = inline_images(markdown, images_data)
+
+        # Capture image metadata from bounding boxes (requires page dimensions)
+        if page.dimensions:
+            dpi = page.dimensions.dpi
+            images = [
+                ImageMetadata.from_bounding_box(
+                    image_id=page_image_id(index, img.id),
+                    top_left_x=img.top_left_x,
+                    bottom_right_x=img.bottom_right_x,
+                    dpi=dpi,
+                )
+                for img in page.images
+                if img.top_left_x is not None and img.bottom_right_x is not None
+            ]
+
+    return OcrPage(index=index, markdown=markdown, images=images, dimensions=dimensions)
@@ -0,0 +1,59 @@
+"""OCR and translation of a PDF, overlapped page by page."""
+
+from typing import TYPE_CHECKING
+
+from pdf_to_english_py.ocr import PAGE_SEPARATOR, OcrResult, stream_pdf_pages
+from pdf_to_english_py.translate import translate_page_stream
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+    from pathlib import Path
+
+    from mistralai import Mistral
+
+    from pdf_to_english_py.ocr import OcrPage
+
+
+async def ocr_and_translate(
+    pdf_path: Path,
+    client: Mistral,
+    *,
+    page_count: int | None = None,
+    on_ocr_done: Callable[[], object] | None = None,
+) -> tuple[OcrResult, str]:
+    """OCR a PDF page by page, translating each page as soon as it is OCR'd.
+
+    Translation of early pages overlaps with OCR of later ones. Errors from
+    either step propagate unchanged; a translation error is only raised once
+    every page has been OCR'd, so one raised before on_ocr_done is called
+    comes from OCR.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        client: Mistral API client.
+        page_count: Number of pages in the PDF, if already known.
+        on_ocr_done: Called once every page has been OCR'd, while the last
+            translations may still be running.
+
+    Returns:
+        Tuple of (OCR result, translated markdown with pages joined by
+        PAGE_SEPARATOR in page order).
+    """
+    pages: list[OcrPage] = []
+
+    async def ocr_markdown() -> AsyncIterator[tuple[int, str]]:
+        async for page in stream_pdf_pages(pdf_path, client, page_count=page_count):
+            pages.append(page)
+            yield page.index, page.markdown
+        if on_ocr_done is not None:
+            on_ocr_done()
+
+    translations = {
+        index: translated
+        async for index, translated in translate_page_stream(ocr_markdown(), client)
+    }
+    ocr_result = OcrResult.from_pages(pages)
+    translated_markdown = PAGE_SEPARATOR.join(
+        translations[page.index] for page in ocr_result.pages
+    )
+    return ocr_result, translated_markdown
@@ -1,12 +1,24 @@
 """Render module for converting markdown to PDF."""
 
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from markdown_it import MarkdownIt
-from weasyprint import HTML
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+
+from pdf_to_english_py.cache import IMAGE_DIR
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from markdown_it.renderer import RendererHTML
+    from markdown_it.token import Token
+    from markdown_it.utils import EnvType, OptionsDict
+
     from pdf_to_english_py.ocr import ImageMetadata, PageDimensions
 
 # Bundled fonts for consistent rendering across environments
@@ -21,6 +33,9 @@ FONT_URL = _font_url("AtkinsonHyperlegibleNextVF-Variable.ttf")
 FONT_ITALIC_URL = _font_url("AtkinsonHyperlegibleNext-RegularItalic.ttf")
 FONT_BOLD_ITALIC_URL = _font_url("AtkinsonHyperlegibleNext-BoldItalic.ttf")
 
+# OCR images saved to disk are referenced by file URIs under this prefix
+_IMAGE_URI_PREFIX = IMAGE_DIR.as_uri() + "/"
+
 BASE_CSS = f"""
 @font-face {{
     font-family: "Atkinson Hyperlegible";
@@ -138,6 +153,26 @@ blockquote {{
 
 DEFAULT_PAGE_SIZE = (210.0, 297.0)  # A4 in mm
 
+# Parsed BASE_CSS is reused across renders. Font configurations are not safe to
+# share between threads and render_pdf() runs in worker threads, so each thread
+# keeps its own.
+_thread_styles = threading.local()
+
+
+def _base_stylesheet() -> tuple[CSS, FontConfiguration]:
+    """Return this thread's parsed BASE_CSS and the font configuration it uses.
+
+    Returns:
+        Tuple of the BASE_CSS stylesheet and the font configuration holding its
+        @font-face fonts, both created on the thread's first render.
+    """
+    if not hasattr(_thread_styles, "stylesheet"):
+        _thread_styles.font_config = FontConfiguration()
+        _thread_styles.stylesheet = CSS(
+            string=BASE_CSS, font_config=_thread_styles.font_config
+        )
+    return _thread_styles.stylesheet, _thread_styles.font_config
+
 
 def generate_page_css(page_dimensions: PageDimensions | None) -> str:
     """Generate @page CSS rule from page dimensions.
@@ -159,72 +194,79 @@ def generate_page_css(page_dimensions: PageDimensions | None) -> str:
     )
 
 
-def generate_image_css(images: list[ImageMetadata]) -> str:
-    """Generate CSS rules for image sizing based on OCR metadata.
+def _render_image(
+    renderer: RendererHTML,
+    tokens: Sequence[Token],
+    idx: int,
+    options: OptionsDict,
+    env: EnvType,
+) -> str:
+    """Render an image, sized inline from OCR metadata matched by alt text.
 
-    Uses CSS attribute selectors to target images by their alt text,
-    which is preserved from the OCR image ID through the pipeline.
+    An inline style spares WeasyPrint matching one attribute selector per image
+    against every <img> in the document.
+    """
+    token = tokens[idx]
+    alt = renderer.renderInlineAsText(token.children or [], options, env)
+    width_mm = env.get("image_widths", {}).get(alt)
+    if width_mm is not None:
+        token.attrSet("style", f"width: {width_mm}mm; height: auto;")
+    return renderer.image(tokens, idx, options, env)
 
-    Args:
-        images: List of ImageMetadata with sizing information.
 
-    Returns:
-        CSS rules for image sizing, or empty string if no images.
-    """
-    if not images:
-        return ""
-
-    rules = []
-    for img in images:
-        # Escape quotes in image ID for CSS attribute selector
-        safe_id = img.image_id.replace('"', '\\"')
-        rules.append(
-            f'img[alt="{safe_id}"] {{ width: {img.width_mm}mm; height: auto; }}'
-        )
+def _create_markdown_parser() -> MarkdownIt:
+    # Create markdown parser with HTML passthrough enabled
+    md = MarkdownIt("commonmark", {"html": True})
+
+    # markdown-it rejects file: URLs; allow those of images saved during OCR only
+    validate_link = md.validateLink
+    md.validateLink = lambda url: (
+        url.startswith(_IMAGE_URI_PREFIX) or validate_link(url)
+    )
+    md.add_render_rule("image", _render_image)
+    return md
 
-    return "\n".join(rules)
 
+# Built once: parsing keeps its state per call, so renders can share the parser
+_MARKDOWN_PARSER = _create_markdown_parser()
 
-def markdown_to_html(markdown: str) -> str:
+
+def markdown_to_html(markdown: str, images: list[ImageMetadata] | None = None) -> str:
     """Convert markdown to HTML, preserving embedded HTML content.
 
-    Uses markdown-it-py which passes through HTML tags unchanged.
+    Uses markdown-it-py which passes through HTML tags unchanged. Images are
+    matched to their OCR metadata by alt text, which is preserved from the OCR
+    image ID through the pipeline, and given an inline width.
 
     Args:
-        markdown: Markdown content with embedded HTML tables and base64 images.
+        markdown: Markdown content with embedded HTML tables and image URIs.
+        images: Optional image metadata for dynamic sizing.
 
     Returns:
         HTML body content (without document wrapper).
     """
-    # Create markdown parser with HTML passthrough enabled
-    md = MarkdownIt("commonmark", {"html": True})
-    return md.render(markdown)
+    image_widths = {img.image_id: img.width_mm for img in images or []}
+    return _MARKDOWN_PARSER.render(markdown, {"image_widths": image_widths})
 
 
 def wrap_with_styles(
     html_body: str,
-    images: list[ImageMetadata] | None = None,
     page_dimensions: PageDimensions | None = None,
 ) -> str:
-    """Wrap HTML body with document structure and styling.
+    """Wrap HTML body with document structure and its page size and margins.
 
-    Adds basic styling for:
-    - Atkinson Hyperlegible font (bundled)
-    - Table borders
-    - Page size and margins (from OCR or A4 default)
-    - Dynamic image sizing (if metadata provided)
+    Page size comes from OCR or defaults to A4. The shared BASE_CSS (fonts,
+    type scale, tables) is applied by html_to_pdf, and images are sized inline
+    by markdown_to_html.
 
     Args:
         html_body: Raw HTML body content.
-        images: Optional image metadata for dynamic sizing.
         page_dimensions: Optional page dimensions from OCR.
 
     Returns:
         Complete HTML document with <!DOCTYPE>, <html>, <head>, <style>, and <body>.
     """
     page_css = generate_page_css(page_dimensions)
-    image_css = generate_image_css(images or [])
-    all_css = BASE_CSS + "\n" + page_css + ("\n" + image_css if image_css else "")
 
     return f"""<!DOCTYPE html>
 <html lang="en">
@@ -233,7 +275,7 @@ def wrap_with_styles(
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Translated Document</title>
     <style>
-{all_css}
+{page_css}
     </style>
 </head>
 <body>
@@ -244,7 +286,7 @@ def wrap_with_styles(
 
 
 def html_to_pdf(html: str, output_path: Path) -> Path:
-    """Render HTML to PDF using WeasyPrint.
+    """Render HTML to PDF using WeasyPrint, styled with BASE_CSS.
 
     Args:
         html: Complete HTML document with styles.
@@ -253,8 +295,9 @@ def html_to_pdf(html: str, output_path: Path) -> Path:
     Returns:
         Path to the generated PDF file.
     """
+    stylesheet, font_config = _base_stylesheet()
     html_doc = HTML(string=html)
-    html_doc.write_pdf(output_path)
+    html_doc.write_pdf(output_path, stylesheets=[stylesheet], font_config=font_config)
     return output_path
 
 
@@ -269,7 +312,7 @@ def render_pdf(
     Convenience function that combines all rendering steps.
 
     Args:
-        markdown: Translated markdown with HTML tables and base64 images.
+        markdown: Translated markdown with HTML tables and image URIs.
         output_path: Path for the output PDF.
         images: Optional image metadata for dynamic sizing.
         page_dimensions: Optional page dimensions from OCR.
@@ -277,8 +320,42 @@ def render_pdf(
     Returns:
         Path to the generated PDF file.
     """
-    html_body = markdown_to_html(markdown)
-    full_html = wrap_with_styles(
-        html_body, images=images, page_dimensions=page_dimensions
-    )
+    html_body = markdown_to_html(markdown, images=images)
+    full_html = wrap_with_styles(html_body, page_dimensions=page_dimensions)
     return html_to_pdf(full_html, output_path)
+
+
+# Arguments of render_pdf(): markdown, output path, images, page dimensions
+type RenderJob = tuple[str, Path, list[ImageMetadata] | None, PageDimensions | None]
+
+
+def render_pdfs(jobs: list[RenderJob], max_workers: int | None = None) -> list[Path]:
+    """Render several documents to PDF in parallel worker processes.
+
+    WeasyPrint layout is CPU-bound and holds the GIL, so documents are spread
+    over processes rather than threads. Each worker parses BASE_CSS once and
+    reuses it for every document it renders. A single document is rendered in
+    this process, skipping the pool start-up.
+
+    Args:
+        jobs: (markdown, output_path, images, page_dimensions) for each
+            document, as passed to render_pdf().
+        max_workers: Maximum worker processes; defaults to one per CPU.
+
+    Returns:
+        Paths to the generated PDF files, in the same order as the jobs.
+    """
+    if len(jobs) <= 1:
+        return [_render_job(job) for job in jobs]
+
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_job, jobs))
+
+
+def _render_job(job: RenderJob) -> Path:
+    """Render one job in a worker; module-level so the pool can pickle it."""
+    markdown, output_path, images, page_dimensions = job
+    return render_pdf(
+        markdown, output_path, images=images, page_dimensions=page_dimensions
+    )
@@ -1,5 +1,8 @@
 """UI theme, CSS, and pipeline display constants for the Gradio app."""
 
+import functools
+from html import escape
+
 from gradio.themes import Base, Color
 
 # Custom copper accent colour palette
@@ -98,6 +101,26 @@ _PIPELINE_STEPS = (
     ("render", "Rendering PDF\u2026"),
 )
 
+# Pre-rendered HTML for each step in each state, keyed by (step ID, state class)
+_STAGE_HTML = {
+    (step_id, cls): (
+        f'<div class="{cls}">'
+        f'<div class="stage-dot"></div>'
+        f'<div class="stage-check">{_TICK_SVG}</div>'
+        f"<span>{label}</span>"
+        f"</div>"
+    )
+    for step_id, label in _PIPELINE_STEPS
+    for cls in ("stage", "stage active", "stage done")
+}
+
+_COMPLETE_HTML = (
+    '<div class="complete-line">'
+    f'<div class="check-icon">{_TICK_SVG}</div>'
+    "<span>Translation complete!</span>"
+    "</div>"
+)
+
 # Combined CSS for the Gradio app
 ALL_CSS = (
     f"{_CONTAINER_CSS} {_INPUT_ERROR_CSS} {_HIDE_FOOTER_CSS}"
@@ -118,42 +141,41 @@ def pipeline_html(
         active: ID of the currently-running step.
         done: Set of step IDs that have completed.
         complete: If True, mark all steps done and show success message.
-        error: If set, display an error message below the pipeline.
+        error: If set, display an error message below the pipeline. The text is
+            HTML-escaped, so exception messages can be passed as they are.
 
     Returns:
         HTML string for the pipeline status.
     """
-    done = done or set()
+    html = _stages_html(active=active, done=frozenset(done or ()), complete=complete)
+    if error:
+        html += f'<div class="error-line">{escape(error)}</div>'
+    return html
+
+
+@functools.cache
+def _stages_html(*, active: str | None, done: frozenset[str], complete: bool) -> str:
+    """Build the stages and completion line, memoised per pipeline state.
+
+    There are only a few dozen states, so every one seen stays cached; error
+    messages, which vary, are added by pipeline_html() outside the cache.
+    """
     if complete:
-        done = {step_id for step_id, _ in _PIPELINE_STEPS}
+        done = frozenset(step_id for step_id, _ in _PIPELINE_STEPS)
 
     lines: list[str] = []
-    for step_id, label in _PIPELINE_STEPS:
+    for step_id, _ in _PIPELINE_STEPS:
         if step_id in done:
             cls = "stage done"
         elif step_id == active:
             cls = "stage active"
         else:
             cls = "stage"
-        lines.append(
-            f'<div class="{cls}">'
-            f'<div class="stage-dot"></div>'
-            f'<div class="stage-check">{_TICK_SVG}</div>'
-            f"<span>{label}</span>"
-            f"</div>"
-        )
+        lines.append(_STAGE_HTML[step_id, cls])
 
     html = '<div class="pipeline">' + "".join(lines) + "</div>"
 
     if complete:
-        html += (
-            '<div class="complete-line">'
-            f'<div class="check-icon">{_TICK_SVG}</div>'
-            "<span>Translation complete!</span>"
-            "</div>"
-        )
-
-    if error:
-        html += f'<div class="error-line">{error}</div>'
+        html += _COMPLETE_HTML
 
     return html
@@ -1,85 +1,257 @@
 """Translation module using Mistral Large."""
 
+import asyncio
 import re
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from pdf_to_english_py.batch import (
+    BATCH_POLL_INTERVAL,
+    parse_batch_bodies,
+    run_batch_job,
+)
+from pdf_to_english_py.cache import cache_key, read_cache, write_cache
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator
+
     from mistralai import Mistral
+    from mistralai.models import MessagesTypedDict
+
+TRANSLATION_MODEL = "mistral-large-latest"
 
-TRANSLATION_SYSTEM_PROMPT = """\
+# Cap on in-flight translation requests, to stay within Mistral rate limits
+MAX_CONCURRENT_TRANSLATIONS = 8
+
+_PROMPT_INTRO = """\
 You are a professional translator specialising in document translation.
 Translate the following document to British English.
 
-CRITICAL RULES - YOU MUST FOLLOW THESE EXACTLY:
+CRITICAL RULES - YOU MUST FOLLOW THESE EXACTLY:"""
 
-1. PRESERVE ALL HTML TAGS EXACTLY AS THEY APPEAR:
+_HTML_RULE = """\
+PRESERVE ALL HTML TAGS EXACTLY AS THEY APPEAR:
    - Keep all <table>, <tr>, <td>, <th> tags unchanged
    - Keep all attributes like colspan="2", rowspan="3" exactly as written
-   - Keep all <div>, <span>, and other HTML tags with their attributes
+   - Keep all <div>, <span>, and other HTML tags with their attributes"""
 
-2. PRESERVE ALL MARKDOWN FORMATTING:
+_MARKDOWN_RULE = """\
+PRESERVE ALL MARKDOWN FORMATTING:
    - Keep headers (# ## ###) at the start of lines
    - Keep bold (**text**) and italic (*text*) markers
    - Keep list markers (- or *)
-   - Keep code blocks and inline code
+   - Keep code blocks and inline code"""
 
-3. PRESERVE ALL IMAGE PLACEHOLDERS EXACTLY:
+_IMAGE_RULE = """\
+PRESERVE ALL IMAGE PLACEHOLDERS EXACTLY:
    - Keep ![filename](IMG_PLACEHOLDER_N) format unchanged
-   - Do not modify image filenames or placeholder values
+   - Do not modify image filenames or placeholder values"""
 
-4. ONLY TRANSLATE THE ACTUAL TEXT CONTENT:
+_HTML_TEXT_RULE = """\
+ONLY TRANSLATE THE ACTUAL TEXT CONTENT:
    - Translate text inside HTML tags
    - Do NOT translate HTML attribute values
-   - Do NOT translate URLs, file paths, or code
+   - Do NOT translate URLs, file paths, or code"""
+
+_TEXT_RULE = """\
+ONLY TRANSLATE THE ACTUAL TEXT CONTENT:
+   - Do NOT translate URLs, file paths, or code"""
 
-5. MAINTAIN DOCUMENT STRUCTURE:
+_STRUCTURE_RULE = """\
+MAINTAIN DOCUMENT STRUCTURE:
    - Keep the same line breaks and spacing
-   - Keep the same paragraph structure
+   - Keep the same paragraph structure"""
+
+_SEGMENT_RULE = """\
+PRESERVE ALL SEGMENT MARKERS EXACTLY:
+   - Keep every <<<SEG N>>> line unchanged, on its own line and in order
+   - Translate the text between markers independently of its neighbours"""
+
+_PROMPT_OUTRO = "Return ONLY the translated document. Do not add explanations or notes."
+
+
+def _system_prompt(*rules: str) -> str:
+    """Assemble a translation system prompt from numbered rules."""
+    numbered = [f"{number}. {rule}" for number, rule in enumerate(rules, start=1)]
+    return "\n\n".join([_PROMPT_INTRO, *numbered, _PROMPT_OUTRO])
+
+
+# Prompt for text containing HTML, such as OCR tables
+TRANSLATION_SYSTEM_PROMPT = _system_prompt(
+    _HTML_RULE,
+    _MARKDOWN_RULE,
+    _IMAGE_RULE,
+    _HTML_TEXT_RULE,
+    _STRUCTURE_RULE,
+    _SEGMENT_RULE,
+)
+
+# Shorter prompt for plain markdown, without the HTML preservation rules
+TEXT_TRANSLATION_SYSTEM_PROMPT = _system_prompt(
+    _MARKDOWN_RULE,
+    _IMAGE_RULE,
+    _TEXT_RULE,
+    _STRUCTURE_RULE,
+    _SEGMENT_RULE,
+)
+
+# System message opening translation requests under each prompt; the SDK only
+# reads them
+_SYSTEM_MESSAGES: dict[str, MessagesTypedDict] = {
+    prompt: {"role": "system", "content": prompt}
+    for prompt in (TRANSLATION_SYSTEM_PROMPT, TEXT_TRANSLATION_SYSTEM_PROMPT)
+}
+
+# Characters of segments packed into one request (~4k tokens), keeping each
+# response well inside output limits and unlikely to lose its markers
+MAX_PACKED_CHARS = 16_000
+
+# Markdown images with data or file URIs; URIs never contain whitespace, and
+# excluding it stops near-misses scanning on through the rest of the page
+_IMAGE_LINK = re.compile(r"!\[([^\]]*)\]\(((?:data:image/|file://)[^\s)]+)\)", re.ASCII)
+
+# Image link targets left by strip_images()
+_PLACEHOLDER_LINK = re.compile(r"\]\((IMG_PLACEHOLDER_\d+)\)")
+
+# Blank-line runs separating independently translatable segments
+_SEGMENT_BREAK = re.compile(r"(\n[ \t]*\n\s*)")
+
+# Opening line of a fenced code block, capturing its fence; backtick fences
+# cannot have backticks in their info string, so ```code``` is inline code
+_FENCE_OPEN = re.compile(r"^ {0,3}(`{3,}(?!.*`)|~{3,})")
+
+# Opening tag of an HTML block whose content may contain blank lines
+_HTML_BLOCK_OPEN = re.compile(
+    r"^ {0,3}<(table|div|pre|blockquote|ul|ol|dl|figure|details)\b", re.IGNORECASE
+)
+
+# Markup carrying no translatable words: HTML tags and entities, code spans,
+# URLs, and image links left by strip_images() (their alt text is an OCR ID)
+_NON_TEXT = re.compile(
+    r"<[^>]*>|&#?\w+;|`[^`]*`|https?://\S+|!\[[^\]]*\]\(IMG_PLACEHOLDER_\d+\)"
+)
 
-Return ONLY the translated document. Do not add explanations or notes."""
+# An HTML opening or closing tag, which calls for the HTML preservation rules
+_HTML_TAG = re.compile(r"</?[A-Za-z][^>]*>")
+
+# Marker line introducing each segment in a packed translation request
+_SEGMENT_MARKER = re.compile(r"^<<<SEG (\d+)>>>[ \t]*$", re.MULTILINE)
 
 
 def strip_images(markdown: str) -> tuple[str, dict[str, str]]:
-    """Strip base64 images from markdown, replacing with placeholders.
+    """Strip image URIs from markdown, replacing with placeholders.
+
+    Covers both base64 data URIs and file URIs of images saved during OCR.
+    Repeats of the same URI (a logo on every page) share one placeholder.
 
     Args:
-        markdown: Markdown content potentially containing base64 data URIs.
+        markdown: Markdown content potentially containing image URIs.
 
     Returns:
-        Tuple of (stripped markdown, dict mapping placeholders to data URIs).
+        Tuple of (stripped markdown, dict mapping placeholders to image URIs).
     """
-    pattern = r"!\[([^\]]*)\]\((data:image/[^)]+)\)"
-    images: dict[str, str] = {}
-    counter = 0
+    placeholders: dict[str, str] = {}
 
     def replacer(match: re.Match[str]) -> str:
-        nonlocal counter
-        alt_text, data_uri = match.group(1), match.group(2)
-        placeholder = f"IMG_PLACEHOLDER_{counter}"
-        images[placeholder] = data_uri
-        counter += 1
+        alt_text, image_uri = match.group(1), match.group(2)
+        placeholder = placeholders.setdefault(
+            image_uri, f"IMG_PLACEHOLDER_{len(placeholders)}"
+        )
         return f"![{alt_text}]({placeholder})"
 
-    return re.sub(pattern, replacer, markdown), images
+    stripped = _IMAGE_LINK.sub(replacer, markdown)
+    return stripped, {placeholder: uri for uri, placeholder in placeholders.items()}
 
 
 def restore_images(markdown: str, images: dict[str, str]) -> str:
-    """Restore base64 images from placeholders.
+    """Restore image URIs from placeholders.
 
     Args:
         markdown: Markdown with placeholders.
-        images: Dict mapping placeholders to original data URIs.
+        images: Dict mapping placeholders to original image URIs.
+
+    Returns:
+        Markdown with image URIs restored.
+    """
+    return _PLACEHOLDER_LINK.sub(
+        lambda match: f"]({images.get(match.group(1), match.group(1))})", markdown
+    )
+
+
+def pack_segments(segments: list[str]) -> str:
+    """Join segments into one request body, each introduced by a marker line.
+
+    Args:
+        segments: Markdown segments to translate together.
+
+    Returns:
+        Segments separated by blank lines and numbered <<<SEG N>>> markers.
+    """
+    return "\n\n".join(
+        f"<<<SEG {index}>>>\n{segment}" for index, segment in enumerate(segments)
+    )
+
+
+def unpack_segments(packed: str, count: int) -> list[str] | None:
+    """Split a translated packed body back into its segments.
+
+    Args:
+        packed: Translation of a pack_segments() body.
+        count: Number of segments that were packed.
+
+    Returns:
+        Translated segments in marker order, or None if the markers did not
+        survive translation intact or a segment came back empty.
+    """
+    parts = _SEGMENT_MARKER.split(packed)
+    if parts[1::2] != [str(index) for index in range(count)]:
+        return None
+    segments = [segment.strip() for segment in parts[2::2]]
+    return segments if all(segments) else None
+
+
+def select_system_prompt(markdown: str) -> str:
+    """Choose the system prompt for translating markdown.
+
+    Args:
+        markdown: Stripped markdown to be translated.
+
+    Returns:
+        TRANSLATION_SYSTEM_PROMPT if the markdown contains HTML tags, otherwise
+        the shorter TEXT_TRANSLATION_SYSTEM_PROMPT.
+    """
+    if _HTML_TAG.search(markdown):
+        return TRANSLATION_SYSTEM_PROMPT
+    return TEXT_TRANSLATION_SYSTEM_PROMPT
+
+
+def _translation_messages(markdown: str, prompt: str) -> list[MessagesTypedDict]:
+    """Build the chat messages asking Mistral to translate stripped markdown."""
+    return [_SYSTEM_MESSAGES[prompt], {"role": "user", "content": markdown}]
+
+
+def parse_batch_output(output: str) -> dict[str, str]:
+    """Parse a Mistral batch output file into translated content by custom_id.
+
+    Args:
+        output: JSONL text of the batch output file, one result per line.
 
     Returns:
-        Markdown with base64 images restored.
+        Dict mapping each request's custom_id to the completion content.
+        Requests with non-text content map to an empty string.
     """
-    result = markdown
-    for placeholder, data_uri in images.items():
-        result = result.replace(f"]({placeholder})", f"]({data_uri})")
-    return result
+    return {
+        custom_id: _completion_text(body)
+        for custom_id, body in parse_batch_bodies(output).items()
+    }
+
 
+def _completion_text(body: dict[str, Any]) -> str:
+    """Extract the text of a chat completion response body."""
+    content = body["choices"][0]["message"]["content"]
+    return content if isinstance(content, str) else ""
 
-def translate_markdown(
+
+async def translate_markdown(
     markdown: str,
     client: Mistral,
 ) -> str:
@@ -90,9 +262,15 @@ def translate_markdown(
     - Markdown formatting (headers, bold, lists)
     - Image placeholders (IMG_PLACEHOLDER_N)
 
-    Base64 images are stripped before translation and restored after to reduce
+    Image URIs are stripped before translation and restored after to reduce
     token usage — images don't need translation.
 
+    The markdown is split into blank-line-separated segments, each cached on
+    disk by model, prompt, and text. Boilerplate repeated across pages or
+    documents (headers, footers, disclaimers) is therefore translated once, and
+    uncached segments are packed together into as few requests as possible,
+    with up to MAX_CONCURRENT_TRANSLATIONS of them in flight.
+
     Args:
         markdown: Source markdown with embedded HTML tables and images.
         client: Mistral API client.
@@ -100,20 +278,399 @@ def translate_markdown(
     Returns:
         Markdown translated to British English with all formatting preserved.
     """
-    # Strip base64 images to reduce token usage
+    return await _translate_page(
+        markdown, client, asyncio.Semaphore(MAX_CONCURRENT_TRANSLATIONS)
+    )
+
+
+async def _translate_page(
+    markdown: str, client: Mistral, semaphore: asyncio.Semaphore
+) -> str:
+    """Translate one page's markdown, holding semaphore for each request."""
+    # Strip image URIs to reduce token usage
     stripped_markdown, images = strip_images(markdown)
 
-    response = client.chat.complete(
-        model="mistral-large-latest",
-        messages=[
-            {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
-            {"role": "user", "content": stripped_markdown},
-        ],
+    parts = split_segments(stripped_markdown)
+    translations = await _translate_segments(_segment_texts(parts), client, semaphore)
+
+    # Restore image URIs after translation
+    return restore_images(_join_segments(parts, translations), images)
+
+
+def split_segments(markdown: str) -> list[str]:
+    """Split markdown into independently translatable segments at blank lines.
+
+    Blank lines inside fenced code blocks and HTML blocks (such as OCR tables)
+    do not split them, so each block is translated whole.
+
+    Args:
+        markdown: Stripped markdown to split.
+
+    Returns:
+        Segments at even indices and the blank-line separators between them at
+        odd indices, so that joining the list gives back the markdown.
+    """
+    parts = _SEGMENT_BREAK.split(markdown)
+    merged = [parts[0]]
+    block = _open_block(parts[0], None)
+    for separator, segment in zip(parts[1::2], parts[2::2], strict=True):
+        if block is None:
+            merged += [separator, segment]
+        else:
+            merged[-1] += separator + segment
+        block = _open_block(segment, block)
+    return merged
+
+
+def _open_block(text: str, block: tuple[str, int] | None) -> tuple[str, int] | None:
+    """Return the fenced code or HTML block still open at the end of text.
+
+    A block is a code fence with depth 0, or an HTML tag name with how deeply
+    it is nested; block is the one open at the start of text, if any.
+    """
+    for line in text.splitlines():
+        if block is None:
+            if fence := _FENCE_OPEN.match(line):
+                block = (fence.group(1), 0)
+                continue
+            if not (tag := _HTML_BLOCK_OPEN.match(line)):
+                continue
+            block = (tag.group(1).lower(), 0)
+
+        name, depth = block
+        if name[0] in "`~":
+            # A closing fence repeats the opening character at least as often
+            closing = line.strip()
+            if len(closing) >= len(name) and closing == name[0] * len(closing):
+                block = None
+            continue
+
+        for slash in re.findall(rf"<(/?){name}\b", line, re.IGNORECASE):
+            depth += -1 if slash else 1
+        block = (name, depth) if depth > 0 else None
+    return block
+
+
+def _segment_texts(parts: list[str]) -> list[str]:
+    """Return the non-blank segment texts of split markdown, stripped."""
+    return [segment for part in parts[::2] if (segment := part.strip())]
+
+
+def _join_segments(parts: list[str], translations: dict[str, str]) -> str:
+    """Reassemble split markdown, swapping each segment for its translation."""
+    joined = parts.copy()
+    for index in range(0, len(parts), 2):
+        segment = parts[index].strip()
+        if segment:
+            joined[index] = parts[index].replace(segment, translations[segment], 1)
+    return "".join(joined)
+
+
+def _segment_key(segment: str) -> str:
+    """Cache key for one segment's translation under the current model and prompt."""
+    return cache_key(
+        "segment", TRANSLATION_MODEL, select_system_prompt(segment), segment
+    )
+
+
+def group_segments(segments: list[str], max_chars: int) -> list[list[str]]:
+    """Group consecutive segments into packed requests of bounded size.
+
+    Args:
+        segments: Segments to translate, in document order.
+        max_chars: Maximum total characters of segments in one group. A
+            segment longer than this gets a group of its own.
+
+    Returns:
+        Groups of segments, preserving order.
+    """
+    groups: list[list[str]] = []
+    size = 0
+    for segment in segments:
+        if not groups or size + len(segment) > max_chars:
+            groups.append([])
+            size = 0
+        groups[-1].append(segment)
+        size += len(segment)
+    return groups
+
+
+def has_translatable_text(segment: str) -> bool:
+    """Check whether a segment has any words for the model to translate.
+
+    Segments of only markup, numbers, or image placeholders (page numbers,
+    separators, figure-only pages, numeric tables) are kept as they are.
+
+    Args:
+        segment: Stripped markdown segment.
+
+    Returns:
+        True if any letter remains once tags, code, URLs, and images are removed.
+    """
+    return any(char.isalpha() for char in _NON_TEXT.sub("", segment))
+
+
+def _known_translations(segments: list[str]) -> tuple[dict[str, str], list[str]]:
+    """Return the translations known without a request, and the other segments.
+
+    Segments with no translatable text translate to themselves; the rest come
+    from the cache. Duplicate segments are looked up, and reported as misses,
+    once.
+    """
+    translations: dict[str, str] = {}
+    misses: list[str] = []
+    for segment in dict.fromkeys(segments):
+        if not has_translatable_text(segment):
+            translations[segment] = segment
+            continue
+        cached = read_cache(_segment_key(segment))
+        if isinstance(cached, str):
+            translations[segment] = cached
+        else:
+            misses.append(segment)
+    return translations, misses
+
+
+async def _translate_segments(
+    segments: list[str],
+    client: Mistral,
+    semaphore: asyncio.Semaphore,
+) -> dict[str, str]:
+    """Translate segments, reusing cached translations and caching new ones.
+
+    Uncached segments are packed into as few requests as MAX_PACKED_CHARS
+    allows, and the requests run concurrently.
+
+    Args:
+        segments: Segment texts; duplicates are translated once.
+        client: Mistral API client.
+        semaphore: Limit on translation requests in flight, held for each
+            request, including any made when a packed reply falls back.
+
+    Returns:
+        Dict mapping each segment to its translation.
+    """
+    translations, misses = _known_translations(segments)
+
+    async def translate_group(group: list[str]) -> None:
+        translated = await _translate_packed(group, client, semaphore)
+        for segment, translation in zip(group, translated, strict=True):
+            write_cache(_segment_key(segment), translation)
+            translations[segment] = translation
+
+    await asyncio.gather(*(translate_group(group) for group in _request_groups(misses)))
+    return translations
+
+
+def _request_groups(segments: list[str]) -> list[list[str]]:
+    """Group segments into requests that each share a single system prompt.
+
+    Keeping prompts apart means each segment is translated, and cached, under
+    the prompt select_system_prompt() chooses for it.
+    """
+    by_prompt: dict[str, list[str]] = {}
+    for segment in segments:
+        by_prompt.setdefault(select_system_prompt(segment), []).append(segment)
+    return [
+        group
+        for prompt_segments in by_prompt.values()
+        for group in group_segments(prompt_segments, MAX_PACKED_CHARS)
+    ]
+
+
+async def _translate_packed(
+    segments: list[str], client: Mistral, semaphore: asyncio.Semaphore
+) -> list[str]:
+    """Translate segments in one request, falling back to one request each.
+
+    All segments must share a system prompt, as _request_groups() ensures. The
+    fallback covers responses where the model mangled the segment markers.
+    """
+    prompt = select_system_prompt(segments[0])
+    if len(segments) == 1:
+        translated = await _complete_translation(segments[0], client, prompt, semaphore)
+        return [translated.strip()]
+
+    packed = await _complete_translation(
+        pack_segments(segments), client, prompt, semaphore
     )
+    unpacked = unpack_segments(packed, len(segments))
+    if unpacked is not None:
+        return unpacked
+
+    return await _translate_each(segments, client, semaphore)
+
+
+async def _translate_each(
+    segments: list[str], client: Mistral, semaphore: asyncio.Semaphore
+) -> list[str]:
+    """Translate segments concurrently, one request per segment."""
+    return [
+        translated.strip()
+        for translated in await asyncio.gather(
+            *(
+                _complete_translation(
+                    segment, client, select_system_prompt(segment), semaphore
+                )
+                for segment in segments
+            )
+        )
+    ]
+
+
+async def _complete_translation(
+    stripped_markdown: str,
+    client: Mistral,
+    prompt: str,
+    semaphore: asyncio.Semaphore,
+) -> str:
+    """Request a translation of stripped markdown from Mistral Large.
+
+    The request holds semaphore while in flight, so its limit counts requests.
+
+    Raises:
+        RuntimeError: If the reply has no text, which would otherwise be cached
+            as the translation and drop the source text from every document.
+    """
+    async with semaphore:
+        response = await client.chat.complete_async(
+            model=TRANSLATION_MODEL,
+            messages=_translation_messages(stripped_markdown, prompt),
+        )
 
     # Extract the translated content
     content = response.choices[0].message.content
-    if isinstance(content, str):
-        # Restore base64 images after translation
-        return restore_images(content, images)
-    return ""
+    if not isinstance(content, str) or not content.strip():
+        msg = "Mistral returned an empty translation"
+        raise RuntimeError(msg)
+    return content
+
+
+async def translate_page_stream(
+    pages: AsyncIterable[tuple[int, str]],
+    client: Mistral,
+    max_concurrency: int = MAX_CONCURRENT_TRANSLATIONS,
+) -> AsyncIterator[tuple[int, str]]:
+    """Translate pages as they arrive, yielding each translation as it completes.
+
+    Lets translation of early pages overlap with producing later ones, such as
+    OCR pages streamed by stream_pdf_pages(). Each page is translated as by
+    translate_markdown(), with one limit on requests in flight shared by all
+    pages.
+
+    Args:
+        pages: Async iterable of (page index, markdown) pairs.
+        client: Mistral API client.
+        max_concurrency: Maximum number of translation requests in flight,
+            across all pages.
+
+    Yields:
+        (page index, translated markdown) pairs in completion order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: asyncio.Queue[tuple[int, str] | None] = asyncio.Queue()
+
+    async def translate_page(index: int, markdown: str) -> None:
+        await results.put((index, await _translate_page(markdown, client, semaphore)))
+
+    async def feed() -> None:
+        tasks: list[asyncio.Task[None]] = []
+        try:
+            async for index, markdown in pages:
+                tasks.append(asyncio.create_task(translate_page(index, markdown)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Wake the consumer even on failure; it then re-raises via the feeder
+            results.put_nowait(None)
+
+    feeder = asyncio.create_task(feed())
+    try:
+        while (result := await results.get()) is not None:
+            yield result
+        await feeder
+    finally:
+        feeder.cancel()
+
+
+async def translate_markdown_batch(
+    pages: list[str],
+    client: Mistral,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+) -> list[str]:
+    """Translate pages as a single Mistral batch job.
+
+    Half the price of translate_markdown() but queued, so for non-interactive
+    runs. Pages may come from several documents, so a run over many PDFs can
+    submit all of their pages as one job. Uncached segments from all pages are
+    packed together into requests of up to MAX_PACKED_CHARS, so short pages
+    share a request (and its system prompt). Segments share the
+    translate_markdown() cache: only uncached segments are packed into the job,
+    and its translations are cached for either path. The rare packed request
+    whose segment markers the model mangles is retried as regular requests, one
+    per segment and up to MAX_CONCURRENT_TRANSLATIONS at once, rather than as a
+    second batch job.
+
+    Args:
+        pages: Markdown content of each page.
+        client: Mistral API client.
+        poll_interval: Seconds to wait between job status checks.
+
+    Returns:
+        Translated markdown for each page, in the same order as the input.
+
+    Raises:
+        RuntimeError: If the batch job fails or returns no result for a request.
+    """
+    stripped_pages = [strip_images(page) for page in pages]
+    page_parts = [split_segments(stripped) for stripped, _ in stripped_pages]
+    translations, misses = _known_translations(
+        [segment for parts in page_parts for segment in _segment_texts(parts)]
+    )
+    groups = _request_groups(misses)
+
+    if groups:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSLATIONS)
+        bodies = await run_batch_job(
+            client,
+            endpoint="/v1/chat/completions",
+            model=TRANSLATION_MODEL,
+            requests=[
+                {
+                    "custom_id": str(index),
+                    "body": {
+                        "messages": _translation_messages(
+                            group[0] if len(group) == 1 else pack_segments(group),
+                            select_system_prompt(group[0]),
+                        )
+                    },
+                }
+                for index, group in enumerate(groups)
+            ],
+            poll_interval=poll_interval,
+        )
+
+        for index, group in enumerate(groups):
+            # Requests that failed inside a successful job are left out of its
+            # output
+            if str(index) not in bodies:
+                msg = f"Batch translation returned no result for request {index}"
+                raise RuntimeError(msg)
+            translated = _completion_text(bodies[str(index)]).strip()
+            if len(group) == 1:
+                unpacked = [translated] if translated else None
+            else:
+                unpacked = unpack_segments(translated, len(group))
+            # Empty replies are retried too; regular requests raise rather
+            # than cache a missing translation
+            if unpacked is None:
+                unpacked = await _translate_each(group, client, semaphore)
+            for segment, translation in zip(group, unpacked, strict=True):
+                write_cache(_segment_key(segment), translation)
+                translations[segment] = translation
+
+    return [
+        restore_images(_join_segments(parts, translations), images)
+        for parts, (_, images) in zip(page_parts, stripped_pages, strict=True)
+    ]
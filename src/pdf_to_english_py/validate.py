@@ -1,7 +1,50 @@
 """Validation functions for API key and input checks."""
 
+import asyncio
+import time
+import weakref
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
 from mistralai import Mistral
 from mistralai.models import NoResponseError, SDKError
+from pypdf.errors import PyPdfError
+
+from pdf_to_english_py.ocr import count_pages
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    from pathlib import Path
+
+# Mistral OCR document limits
+MAX_PDF_SIZE_MB = 50
+MAX_PDF_PAGES = 1000
+
+# API keys with a shared client, and with a remembered validation result
+_MAX_CACHED_KEYS = 8
+
+# Seconds a successful key validation is trusted before checking again
+VALIDATION_TTL = 540.0
+
+# Seconds a key Mistral rejected is refused before checking again
+REJECTION_TTL = 60.0
+
+# When each recently checked key passed or was rejected, least recently used first
+_validated_at: dict[str, float] = {}
+_rejected_at: dict[str, float] = {}
+
+# Clients shared on each running event loop by API key, least recently used
+# first; a loop's entry is dropped when it shuts down or is garbage collected
+_loop_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, Mistral]
+] = weakref.WeakKeyDictionary()
+
+# Tasks closing clients, referenced until they finish so they are not collected
+_closing: set[asyncio.Task[None]] = set()
+
+_INVALID_KEY_MESSAGE = (
+    "Invalid API key. Please check your Mistral API key and try again."
+)
 
 
 def validate_api_key_format(api_key: str) -> bool:
@@ -16,40 +59,178 @@ def validate_api_key_format(api_key: str) -> bool:
     return bool(api_key.strip())
 
 
-def validate_api_key_with_mistral(api_key: str) -> tuple[bool, str, Mistral | None]:
-    """Validate API key by making a lightweight Mistral API call.
-
-    Creates a client and calls models.list() to verify the key.
-    On success, returns the validated client for reuse.
+def validate_pdf(pdf_path: Path) -> tuple[bool, str, int | None]:
+    """Check a PDF is readable and within Mistral OCR limits before uploading.
 
     Args:
-        api_key: The Mistral API key to validate.
+        pdf_path: Path to the uploaded PDF.
 
     Returns:
-        Tuple of (is_valid, error_message, client).
-        error_message is empty string and client is the Mistral instance if valid.
-        client is None if validation failed.
+        Tuple of (is_valid, error_message, page_count).
+        error_message is empty string and page_count the number of pages if
+        valid, so OCR need not parse the PDF again to count them.
+        page_count is None if validation failed.
     """
-    try:
-        client = Mistral(api_key=api_key)
-        client.models.list()
-    except SDKError:
+    size_mb = pdf_path.stat().st_size / 1024**2
+    if size_mb > MAX_PDF_SIZE_MB:
         return (
             False,
-            "Invalid API key. Please check your Mistral API key and try again.",
+            f"PDF is {size_mb:.0f} MB; the maximum is {MAX_PDF_SIZE_MB} MB.",
             None,
         )
-    except NoResponseError:
+
+    try:
+        page_count = count_pages(pdf_path)
+    except PyPdfError:
         return (
             False,
-            "Could not reach Mistral API."
-            " Please check your internet connection and try again.",
+            "Could not read this PDF. Please check the file and try again.",
             None,
         )
-    except Exception:  # noqa: BLE001
+    if page_count > MAX_PDF_PAGES:
         return (
             False,
-            "Validation failed unexpectedly. Please try again.",
+            f"PDF has {page_count} pages; the maximum is {MAX_PDF_PAGES}.",
             None,
         )
-    return True, "", client
+    return True, "", page_count
+
+
+def get_client(api_key: str) -> Mistral:
+    """Return a Mistral client for an API key, shared across requests.
+
+    Each client owns an HTTP connection pool, so reusing it lets repeat
+    translations skip fresh TCP and TLS handshakes with the Mistral API.
+    Pooled connections belong to the event loop that opened them, so clients
+    are shared within the running loop only: the app serves every request
+    from one loop, while each asyncio.run() gets clients of its own. Clients
+    are closed when evicted beyond _MAX_CACHED_KEYS keys, and when their loop
+    shuts down.
+
+    Args:
+        api_key: The Mistral API key.
+
+    Returns:
+        The cached Mistral client for api_key on the running event loop.
+
+    Raises:
+        RuntimeError: If called outside a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _loop_clients.get(loop)
+    if clients is None:
+        clients = _loop_clients[loop] = {}
+        _start_closing(_close_at_shutdown(loop, clients))
+
+    client = clients.pop(api_key, None) or Mistral(api_key=api_key)
+    clients[api_key] = client
+    if len(clients) > _MAX_CACHED_KEYS:
+        _start_closing(_close_client(clients.pop(next(iter(clients)))))
+    return client
+
+
+def _start_closing(closing: Coroutine[Any, Any, None]) -> None:
+    """Run a coroutine closing clients as a task, keeping it until it finishes."""
+    task = asyncio.create_task(closing)
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+async def _close_at_shutdown(
+    loop: asyncio.AbstractEventLoop, clients: dict[str, Mistral]
+) -> None:
+    """Close a loop's shared clients once the loop cancels this task.
+
+    asyncio.run() cancels the tasks still pending when its main coroutine
+    returns, and runs them to completion before closing the loop, so the
+    connections are closed on the loop that opened them.
+    """
+    try:
+        await loop.create_future()
+    finally:
+        _loop_clients.pop(loop, None)
+        for client in clients.values():
+            await _close_client(client)
+
+
+async def _close_client(client: Mistral) -> None:
+    """Close a client's HTTP connection pools."""
+    # Leaving each context closes the matching sync or async httpx client
+    with client:
+        pass
+    async with client:
+        pass
+
+
+async def validate_api_key_with_mistral(
+    api_key: str,
+) -> tuple[bool | None, str, Mistral | None]:
+    """Validate API key by making a lightweight Mistral API call.
+
+    Calls models.list() with the shared client for the key to verify it,
+    warming the connection pool later OCR and translation calls reuse.
+    On success, returns the validated client for reuse. A key that passed
+    within the last VALIDATION_TTL seconds is trusted, and one Mistral
+    rejected within the last REJECTION_TTL seconds refused, without a new call.
+
+    Args:
+        api_key: The Mistral API key to validate.
+
+    Returns:
+        Tuple of (is_valid, error_message, client).
+        error_message is empty string and client is the Mistral instance if valid.
+        is_valid is False only if Mistral rejected the key, and None if the key
+        could not be checked (no connection, rate limits, server errors).
+        client is None if validation failed.
+    """
+    now = time.monotonic()
+    if _seen_within(_validated_at, api_key, VALIDATION_TTL, now):
+        return True, "", get_client(api_key)
+    if _seen_within(_rejected_at, api_key, REJECTION_TTL, now):
+        return False, _INVALID_KEY_MESSAGE, None
+
+    try:
+        client = get_client(api_key)
+        await client.models.list_async()
+    except SDKError as error:
+        # Only an authentication failure says the key itself is bad
+        if error.status_code == HTTPStatus.UNAUTHORIZED:
+            _remember(_rejected_at, api_key, time.monotonic())
+            return False, _INVALID_KEY_MESSAGE, None
+        unchecked_msg = (
+            f"Mistral could not check your API key (HTTP {error.status_code})."
+            " Please try again."
+        )
+    except NoResponseError:
+        unchecked_msg = (
+            "Could not reach Mistral API."
+            " Please check your internet connection and try again."
+        )
+    except Exception:  # noqa: BLE001
+        unchecked_msg = "Validation failed unexpectedly. Please try again."
+    else:
+        _remember(_validated_at, api_key, time.monotonic())
+        return True, "", client
+    return None, unchecked_msg, None
+
+
+def _seen_within(
+    checked_at: dict[str, float], api_key: str, ttl: float, now: float
+) -> bool:
+    """Check whether a key was recorded less than ttl seconds before now.
+
+    Times are time.monotonic() readings. Expired entries are dropped; live ones
+    become the most recently used.
+    """
+    recorded = checked_at.pop(api_key, None)
+    if recorded is None or now - recorded >= ttl:
+        return False
+    checked_at[api_key] = recorded
+    return True
+
+
+def _remember(checked_at: dict[str, float], api_key: str, now: float) -> None:
+    """Record a key as checked at now, evicting the least recently used over the cap."""
+    checked_at[api_key] = now
+    if len(checked_at) > _MAX_CACHED_KEYS:
+        del checked_at[next(iter(checked_at))]
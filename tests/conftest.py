@@ -1,14 +1,31 @@
 """Shared test fixtures."""
 
 import os
+import shutil
+import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
 from dotenv import load_dotenv
 from mistralai import Mistral
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 load_dotenv()
 
+# Point the disk cache at a scratch directory before the package reads it at
+# import, so tests neither reuse nor pollute the user's cached API results
+os.environ["PDF2EN_CACHE_DIR"] = tempfile.mkdtemp(prefix="pdf2en-test-cache-")
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache() -> Iterator[None]:
+    """Empty the disk cache after each test, so every test starts without one."""
+    yield
+    shutil.rmtree(os.environ["PDF2EN_CACHE_DIR"], ignore_errors=True)
+
 
 @pytest.fixture
 def project_root() -> Path:
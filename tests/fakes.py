@@ -0,0 +1,196 @@
+"""In-memory stand-in for the Mistral client, and the PDFs tests feed it.
+
+Lets tests exercise the API paths without making any API calls.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, cast
+
+from mistralai.models import OCRPageObject
+from pypdf import PdfWriter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from mistralai import Mistral
+
+
+def write_blank_pdf(path: Path, pages: int) -> Path:
+    """Write a PDF of blank A4 pages to path, and return path."""
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=595, height=842)
+    writer.write(path)
+    return path
+
+
+class FakeChat:
+    """Chat API that translates with translate(), counting requests in flight."""
+
+    def __init__(
+        self, translate: Callable[[str], str], delay: Callable[[str], float]
+    ) -> None:
+        """Answer each request's user message with translate() after delay()."""
+        self._translate = translate
+        self._delay = delay
+        self.requests: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def complete_async(
+        self, *, model: str, messages: list[dict[str, str]]
+    ) -> SimpleNamespace:
+        """Return a chat completion translating the last message."""
+        del model
+        content = messages[-1]["content"]
+        self.requests.append(content)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay(content))
+        finally:
+            self.in_flight -= 1
+        message = SimpleNamespace(content=self._translate(content))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeOcr:
+    """OCR API answering single-page requests with "Seite N" markdown.
+
+    Counts requests in flight, and records those cancelled while in flight.
+    """
+
+    def __init__(self, delays: dict[int, float], failing: set[int]) -> None:
+        """Delay pages by delays (seconds) and fail those in failing."""
+        self._delays = delays
+        self._failing = failing
+        self.requests: list[int] = []
+        self.cancelled: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def process_async(self, *, pages: list[int], **_: object) -> SimpleNamespace:
+        """Return the requested page after its delay, or raise if it fails."""
+        [index] = pages
+        self.requests.append(index)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delays.get(index, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(index)
+            raise
+        finally:
+            self.in_flight -= 1
+        if index in self._failing:
+            msg = f"OCR failed for page {index}"
+            raise RuntimeError(msg)
+        page = OCRPageObject(
+            index=0, markdown=f"Seite {index}", images=[], dimensions=None
+        )
+        return SimpleNamespace(pages=[page])
+
+
+class FakeFiles:
+    """Files API that accepts uploads and records which files were deleted."""
+
+    def __init__(self) -> None:
+        """Start with no files."""
+        self.uploaded: list[str] = []
+        self.deleted: list[str] = []
+        self.contents: dict[str, bytes] = {}
+
+    async def upload_async(
+        self, *, file: dict[str, Any], purpose: str
+    ) -> SimpleNamespace:
+        """Record the upload and return its file ID."""
+        self.uploaded.append(file["file_name"])
+        return SimpleNamespace(id=f"{purpose}-{len(self.uploaded)}")
+
+    async def get_signed_url_async(self, *, file_id: str) -> SimpleNamespace:
+        """Return a URL naming the file."""
+        return SimpleNamespace(url=f"https://files.example/{file_id}")
+
+    async def delete_async(self, *, file_id: str) -> None:
+        """Record the deletion."""
+        self.deleted.append(file_id)
+
+    async def download_async(self, *, file_id: str) -> SimpleNamespace:
+        """Return a response whose aread() gives the file's contents."""
+        content = self.contents[file_id]
+
+        async def aread() -> bytes:
+            return content
+
+        return SimpleNamespace(aread=aread)
+
+
+class FakeBatchJobs:
+    """Batch jobs that succeed at once, answering each request with respond()."""
+
+    def __init__(
+        self,
+        files: FakeFiles,
+        respond: Callable[[dict[str, Any]], dict[str, Any]],
+    ) -> None:
+        """Write job output to files, with respond() mapping request bodies."""
+        self._files = files
+        self._respond = respond
+        self.requests: list[dict[str, Any]] = []
+
+    async def create_async(
+        self, *, endpoint: str, model: str, requests: list[dict[str, Any]]
+    ) -> SimpleNamespace:
+        """Answer every request and return the finished job."""
+        del endpoint, model
+        self.requests.extend(requests)
+        self._files.contents["batch-output"] = "\n".join(
+            json.dumps(
+                {
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": self._respond(request["body"]),
+                    },
+                }
+            )
+            for request in requests
+        ).encode()
+        return SimpleNamespace(id="job-0", status="SUCCESS", output_file="batch-output")
+
+
+class FakeMistral:
+    """Records the calls a test makes; pass FakeMistral.client to the code."""
+
+    def __init__(
+        self,
+        *,
+        translate: Callable[[str], str] = str.upper,
+        chat_delay: Callable[[str], float] = lambda _: 0,
+        ocr_delays: dict[int, float] | None = None,
+        ocr_failing: set[int] | None = None,
+        batch_response: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    ) -> None:
+        """Create the fake.
+
+        Args:
+            translate: Maps a chat request's user message to its reply.
+            chat_delay: Seconds each chat request takes, given its message.
+            ocr_delays: Seconds each OCR page request takes, by page index.
+            ocr_failing: Indices of pages whose OCR request fails.
+            batch_response: Maps a batch request body to its response body.
+        """
+        self.chat = FakeChat(translate, chat_delay)
+        self.ocr = FakeOcr(ocr_delays or {}, ocr_failing or set())
+        self.files = FakeFiles()
+        self.batch = SimpleNamespace(
+            jobs=FakeBatchJobs(self.files, batch_response or (lambda body: body))
+        )
+
+    @property
+    def client(self) -> Mistral:
+        """This fake, typed as the client it stands in for."""
+        return cast("Mistral", self)
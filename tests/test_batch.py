@@ -0,0 +1,32 @@
+"""Tests for batch module."""
+
+import json
+
+from pdf_to_english_py.batch import parse_batch_bodies
+
+
+def _record(custom_id: str, body: dict[str, object]) -> str:
+    return json.dumps(
+        {"custom_id": custom_id, "response": {"status_code": 200, "body": body}}
+    )
+
+
+class TestParseBatchBodies:
+    """Tests for parsing Mistral batch output files into response bodies."""
+
+    def test_maps_custom_ids_to_bodies(self) -> None:
+        """Each output line should map its custom_id to its response body."""
+        output = "\n".join(
+            [_record("1", {"pages": []}), _record("0", {"model": "ocr"})]
+        )
+
+        assert parse_batch_bodies(output) == {
+            "0": {"model": "ocr"},
+            "1": {"pages": []},
+        }
+
+    def test_skips_blank_lines(self) -> None:
+        """Trailing or blank lines in the JSONL should be ignored."""
+        output = _record("0", {}) + "\n\n"
+
+        assert parse_batch_bodies(output) == {"0": {}}
@@ -0,0 +1,145 @@
+"""Tests for cache module."""
+
+import os
+import pickle
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pdf_to_english_py.cache import (
+    cache_key,
+    file_hash,
+    purge_cache,
+    read_cache,
+    write_cache,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestCacheKey:
+    """Tests for cache_key function."""
+
+    def test_same_parts_give_same_key(self) -> None:
+        """Identical inputs should produce identical keys."""
+        assert cache_key("ocr", b"pdf bytes") == cache_key("ocr", b"pdf bytes")
+
+    def test_different_parts_give_different_keys(self) -> None:
+        """Changing any part should change the key."""
+        assert cache_key("translate", "a") != cache_key("translate", "b")
+
+    def test_part_boundaries_affect_key(self) -> None:
+        """Moving text between parts should not collide."""
+        assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+class TestFileHash:
+    """Tests for file_hash function."""
+
+    def test_hash_depends_on_contents_not_name(self, tmp_path: Path) -> None:
+        """Files with identical bytes should hash identically."""
+        first = tmp_path / "first.pdf"
+        second = tmp_path / "second.pdf"
+        first.write_bytes(b"%PDF-1.4 same")
+        second.write_bytes(b"%PDF-1.4 same")
+
+        assert file_hash(first) == file_hash(second)
+
+    def test_hash_changes_with_contents(self, tmp_path: Path) -> None:
+        """Different file contents should give different hashes."""
+        first = tmp_path / "first.pdf"
+        second = tmp_path / "second.pdf"
+        first.write_bytes(b"%PDF-1.4 one")
+        second.write_bytes(b"%PDF-1.4 two")
+
+        assert file_hash(first) != file_hash(second)
+
+
+class TestReadWriteCache:
+    """Tests for read_cache and write_cache functions."""
+
+    def test_missing_key_returns_none(self, tmp_path: Path) -> None:
+        """Reading a key that was never written should return None."""
+        assert read_cache("missing", cache_dir=tmp_path) is None
+
+    def test_round_trips_value(self, tmp_path: Path) -> None:
+        """A written value should be read back unchanged."""
+        write_cache("key", {"segment": "Bonjour"}, cache_dir=tmp_path)
+
+        assert read_cache("key", cache_dir=tmp_path) == {"segment": "Bonjour"}
+
+    def test_creates_cache_directory(self, tmp_path: Path) -> None:
+        """Writing should create the cache directory if it does not exist."""
+        cache_dir = tmp_path / "nested" / "cache"
+
+        write_cache("key", "value", cache_dir=cache_dir)
+
+        assert read_cache("key", cache_dir=cache_dir) == "value"
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """An unreadable cache file should be treated as a miss."""
+        (tmp_path / "key.pickle").write_bytes(b"")
+
+        assert read_cache("key", cache_dir=tmp_path) is None
+
+    def test_entry_of_missing_class_is_a_miss(self, tmp_path: Path) -> None:
+        """A pickle of a class that has since been renamed should be a miss."""
+        (tmp_path / "key.pickle").write_bytes(b"cpathlib\nRenamedPath\n.")
+
+        assert read_cache("key", cache_dir=tmp_path) is None
+
+    def test_entry_of_missing_module_is_a_miss(self, tmp_path: Path) -> None:
+        """A pickle of a class whose module has since moved should be a miss."""
+        (tmp_path / "key.pickle").write_bytes(b"cmoved_module\nOcrPage\n.")
+
+        assert read_cache("key", cache_dir=tmp_path) is None
+
+    def test_entry_failing_to_rebuild_is_a_miss(self, tmp_path: Path) -> None:
+        """A pickle whose value can no longer be rebuilt should be a miss."""
+        # Unpickles as int("x"), which raises ValueError
+        (tmp_path / "key.pickle").write_bytes(b"cbuiltins\nint\n(S'x'\ntR.")
+
+        assert read_cache("key", cache_dir=tmp_path) is None
+
+    def test_failed_write_leaves_no_file(self, tmp_path: Path) -> None:
+        """A value that cannot be pickled should not leave a temporary file."""
+        with pytest.raises((pickle.PicklingError, AttributeError)):
+            write_cache("key", lambda: None, cache_dir=tmp_path)
+
+        assert list(tmp_path.iterdir()) == []
+
+
+def _age(path: Path, seconds: float) -> None:
+    """Backdate a file's modification time by the given number of seconds."""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+class TestPurgeCache:
+    """Tests for purge_cache function."""
+
+    def test_deletes_only_entries_older_than_max_age(self, tmp_path: Path) -> None:
+        """Stale entries should be deleted and fresh ones kept."""
+        write_cache("stale", "old", cache_dir=tmp_path)
+        write_cache("fresh", "new", cache_dir=tmp_path)
+        _age(tmp_path / "stale.pickle", 7200)
+
+        assert purge_cache(3600, cache_dir=tmp_path) == 1
+        assert read_cache("stale", cache_dir=tmp_path) is None
+        assert read_cache("fresh", cache_dir=tmp_path) == "new"
+
+    def test_deletes_stale_images(self, tmp_path: Path) -> None:
+        """Saved images under the cache directory should be purged as well."""
+        image = tmp_path / "images" / "logo.png"
+        image.parent.mkdir()
+        image.write_bytes(b"png")
+        _age(image, 7200)
+
+        assert purge_cache(3600, cache_dir=tmp_path) == 1
+        assert not image.exists()
+
+    def test_missing_cache_directory_deletes_nothing(self, tmp_path: Path) -> None:
+        """Purging before anything was cached should do nothing."""
+        assert purge_cache(3600, cache_dir=tmp_path / "missing") == 0
@@ -1,5 +1,7 @@
 """End-to-end tests for the full PDF translation pipeline."""
 
+import asyncio
+import re
 from typing import TYPE_CHECKING
 
 import pytest
@@ -9,9 +11,9 @@ if TYPE_CHECKING:
 
     from mistralai import Mistral
 
-from pdf_to_english_py.ocr import extract_pdf
+from pdf_to_english_py.cache import IMAGE_DIR
+from pdf_to_english_py.pipeline import ocr_and_translate
 from pdf_to_english_py.render import render_pdf
-from pdf_to_english_py.translate import translate_markdown
 
 
 @pytest.mark.integration
@@ -26,8 +28,9 @@ def test_processes_multilingual_pdf(
     key document features are preserved throughout.
     """
     # === Execute pipeline ===
-    ocr_result = extract_pdf(e2e_test_pdf, mistral_client)
-    translated_md = translate_markdown(ocr_result.raw_markdown, mistral_client)
+    ocr_result, translated_md = asyncio.run(
+        ocr_and_translate(e2e_test_pdf, mistral_client)
+    )
     output_path = tmp_path / "output.pdf"
     render_pdf(
         translated_md,
@@ -48,14 +51,21 @@ def test_processes_multilingual_pdf(
     assert ocr_result.page_dimensions.height_mm == pytest.approx(297, rel=0.01)
 
     # === Image metadata (mm widths from bounding box / DPI) ===
+    # IDs are qualified by page, since each page's OCR numbers images from 0
+    assert len({i.image_id for i in ocr_result.images}) == 3
     # OCR bounding boxes may be slightly larger than source, allow +3mm tolerance
-    img_widths = {i.image_id: i.width_mm for i in ocr_result.images}
-    expected = {"img-0.jpeg": 50, "img-1.jpeg": 100, "img-2.jpeg": 10}
-    for img_id, source_mm in expected.items():
-        assert source_mm <= img_widths[img_id] <= source_mm + 3
+    img_widths = sorted(i.width_mm for i in ocr_result.images)
+    for width_mm, source_mm in zip(img_widths, [10, 50, 100], strict=True):
+        assert source_mm <= width_mm <= source_mm + 3
 
     # === Content preservation ===
-    assert "data:image" in translated_md  # Base64 images
+    # Images are saved to disk during OCR and referenced by file URI
+    image_dir_uri = IMAGE_DIR.as_uri() + "/"
+    image_uris = re.findall(r"!\[[^\]]*\]\((file://[^)]+)\)", translated_md)
+    assert len(image_uris) == len(ocr_result.images)
+    for uri in image_uris:
+        assert uri.startswith(image_dir_uri)
+        assert (IMAGE_DIR / uri.removeprefix(image_dir_uri)).is_file()
     assert "<table" in translated_md.lower()  # HTML tables
     assert "rowspan" in translated_md.lower()  # Merged cells
     assert "colspan" in translated_md.lower()
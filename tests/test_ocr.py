@@ -1,9 +1,14 @@
 """Tests for OCR module."""
 
+import asyncio
 import base64
-from typing import TYPE_CHECKING
+import dataclasses
+import os
+from typing import TYPE_CHECKING, Any
 
 import pytest
+from mistralai.models import OCRImageObject, OCRPageDimensions, OCRPageObject
+from pypdf import PdfWriter
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -12,35 +17,18 @@ from pdf_to_english_py.ocr import (
     ImageMetadata,
     OcrPage,
     OcrResult,
+    PageDimensions,
     combine_pages,
-    encode_pdf_to_base64,
+    count_pages,
+    extract_pdfs_batch,
     inline_images,
     inline_tables,
+    page_image_id,
+    process_ocr_page,
+    save_image,
+    stream_pdf_pages,
 )
-
-
-class TestEncodePdfToBase64:
-    """Tests for encode_pdf_to_base64 function."""
-
-    def test_encodes_pdf_file_to_base64_string(self, tmp_path: Path) -> None:
-        """A PDF file should be encoded to a valid base64 string."""
-        # Create a minimal test file
-        test_file = tmp_path / "test.pdf"
-        test_content = b"%PDF-1.4 test content"
-        test_file.write_bytes(test_content)
-
-        result = encode_pdf_to_base64(test_file)
-
-        # Should be valid base64
-        decoded = base64.b64decode(result)
-        assert decoded == test_content
-
-    def test_raises_error_for_nonexistent_file(self, tmp_path: Path) -> None:
-        """Should raise FileNotFoundError for missing file."""
-        nonexistent = tmp_path / "missing.pdf"
-
-        with pytest.raises(FileNotFoundError):
-            encode_pdf_to_base64(nonexistent)
+from tests.fakes import FakeMistral, write_blank_pdf
 
 
 class TestInlineTables:
@@ -95,6 +83,18 @@ class TestInlineTables:
         assert 'colspan="2"' in result
         assert 'rowspan="2"' in result
 
+    def test_does_not_rescan_inserted_html(self) -> None:
+        """Placeholder text inside inserted HTML should be left as is."""
+        markdown = "[tbl-0.html](tbl-0.html)"
+        tables = [
+            {"id": "tbl-0.html", "content": "<td>[tbl-1.html](tbl-1.html)</td>"},
+            {"id": "tbl-1.html", "content": "<table></table>"},
+        ]
+
+        result = inline_tables(markdown, tables)
+
+        assert result == "<td>[tbl-1.html](tbl-1.html)</td>"
+
     def test_returns_unchanged_if_no_tables(self) -> None:
         """Markdown without table placeholders should be unchanged."""
         markdown = "Just some text without tables."
@@ -136,6 +136,17 @@ class TestInlineImages:
         assert "![img-0.jpeg](data:image/jpeg;base64,AAAA)" in result
         assert "![img-1.png](data:image/png;base64,BBBB)" in result
 
+    def test_treats_image_ids_literally(self) -> None:
+        """Regex metacharacters in image IDs should match only themselves."""
+        markdown = "![img(0).jpeg](img(0).jpeg) ![imgX0Xjpeg](imgX0Xjpeg)"
+        images = [{"id": "img(0).jpeg", "image_base64": "data:image/jpeg;base64,A"}]
+
+        result = inline_images(markdown, images)
+
+        assert result == (
+            "![img(0).jpeg](data:image/jpeg;base64,A) ![imgX0Xjpeg](imgX0Xjpeg)"
+        )
+
     def test_returns_unchanged_if_no_images(self) -> None:
         """Markdown without image placeholders should be unchanged."""
         markdown = "Just some text without images."
@@ -145,6 +156,112 @@ class TestInlineImages:
 
         assert result == markdown
 
+    def test_uses_alt_text_when_given(self) -> None:
+        """An image's 'alt' field should replace its ID as the alt text."""
+        markdown = "![img-0.jpeg](img-0.jpeg)"
+        images = [
+            {
+                "id": "img-0.jpeg",
+                "alt": "page-1-img-0.jpeg",
+                "image_base64": "data:image/jpeg;base64,A",
+            }
+        ]
+
+        result = inline_images(markdown, images)
+
+        assert result == "![page-1-img-0.jpeg](data:image/jpeg;base64,A)"
+
+
+class TestSaveImage:
+    """Tests for save_image function."""
+
+    def test_writes_decoded_image_and_returns_file_uri(self, tmp_path: Path) -> None:
+        """The decoded bytes should be written to the returned file URI."""
+        data_uri = "data:image/jpeg;base64," + base64.b64encode(b"jpeg").decode()
+
+        uri = save_image(data_uri, "img-0.jpeg", image_dir=tmp_path)
+
+        saved = next(tmp_path.iterdir())
+        assert uri == saved.as_uri()
+        assert saved.suffix == ".jpeg"
+        assert saved.read_bytes() == b"jpeg"
+
+    def test_identical_images_share_one_file(self, tmp_path: Path) -> None:
+        """Images with the same content should map to the same file."""
+        data_uri = "data:image/png;base64," + base64.b64encode(b"logo").decode()
+
+        first = save_image(data_uri, "img-0.png", image_dir=tmp_path)
+        second = save_image(data_uri, "img-7.png", image_dir=tmp_path)
+
+        assert first == second
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_saving_again_refreshes_modification_time(self, tmp_path: Path) -> None:
+        """A re-saved image should count as new, so purging keeps it."""
+        data_uri = "data:image/png;base64," + base64.b64encode(b"logo").decode()
+        save_image(data_uri, "img-0.png", image_dir=tmp_path)
+        saved = next(tmp_path.iterdir())
+        os.utime(saved, (0, 0))
+
+        save_image(data_uri, "img-0.png", image_dir=tmp_path)
+
+        assert saved.stat().st_mtime > 0
+
+
+def _ocr_page(index: int, image_width_px: int) -> OCRPageObject:
+    """Build a one-image OCR page as Mistral returns it for a per-page request."""
+    data_uri = "data:image/jpeg;base64," + base64.b64encode(b"jpeg").decode()
+    return OCRPageObject(
+        index=0,
+        markdown=f"# Page {index}\n\n![img-0.jpeg](img-0.jpeg)",
+        images=[
+            OCRImageObject(
+                id="img-0.jpeg",
+                top_left_x=0,
+                top_left_y=0,
+                bottom_right_x=image_width_px,
+                bottom_right_y=100,
+                image_base64=data_uri,
+            )
+        ],
+        dimensions=OCRPageDimensions(dpi=200, height=2339, width=1654),
+    )
+
+
+class TestProcessOcrPage:
+    """Tests for process_ocr_page function."""
+
+    def test_qualifies_image_ids_by_page(self, tmp_path: Path) -> None:
+        """Pages that both number an image img-0 should keep distinct widths."""
+        pages = [
+            process_ocr_page(_ocr_page(index, width_px), index, image_dir=tmp_path)
+            for index, width_px in [(0, 200), (1, 400)]
+        ]
+
+        result = OcrResult.from_pages(pages)
+
+        assert {img.image_id: img.width_mm for img in result.images} == {
+            "page-0-img-0.jpeg": 25.4,
+            "page-1-img-0.jpeg": 50.8,
+        }
+        assert "![page-0-img-0.jpeg](file://" in pages[0].markdown
+        assert "![page-1-img-0.jpeg](file://" in pages[1].markdown
+
+    def test_saves_images_to_image_dir(self, tmp_path: Path) -> None:
+        """Inlined images should be file URIs of images saved in image_dir."""
+        page = process_ocr_page(_ocr_page(0, 200), 0, image_dir=tmp_path)
+
+        saved = next(tmp_path.iterdir())
+        assert f"({saved.as_uri()})" in page.markdown
+
+
+class TestPageImageId:
+    """Tests for page_image_id function."""
+
+    def test_prefixes_page_index_and_keeps_extension(self) -> None:
+        """The qualified ID should name the page and keep the file extension."""
+        assert page_image_id(2, "img-0.jpeg") == "page-2-img-0.jpeg"
+
 
 class TestImageMetadata:
     """Tests for ImageMetadata dataclass."""
@@ -167,6 +284,14 @@ class TestImageMetadata:
         )
         assert metadata.width_mm == pytest.approx(15.7, rel=0.01)
 
+    def test_is_immutable_and_hashable(self) -> None:
+        """Metadata should be a frozen value usable as a dict or cache key."""
+        metadata = ImageMetadata(image_id="img-0.jpeg", width_mm=23.8)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            metadata.width_mm = 1.0  # type: ignore[misc]
+        assert {metadata: 1}[ImageMetadata("img-0.jpeg", 23.8)] == 1
+
 
 class TestOcrResultWithMetadata:
     """Tests for OcrResult with image metadata."""
@@ -174,12 +299,12 @@ class TestOcrResultWithMetadata:
     def test_ocr_result_stores_image_metadata(self) -> None:
         """OcrResult should store image metadata."""
         images = [ImageMetadata(image_id="img-0.jpeg", width_mm=15.7)]
-        result = OcrResult(pages=[], raw_markdown="", images=images)
+        result = OcrResult(pages=[], images=images)
         assert len(result.images) == 1
 
     def test_ocr_result_defaults_to_empty_images(self) -> None:
         """OcrResult should default to empty images list."""
-        result = OcrResult(pages=[], raw_markdown="")
+        result = OcrResult(pages=[])
         assert result.images == []
 
 
@@ -194,15 +319,78 @@ class TestOcrDataClasses:
         assert page.markdown == "# Title\n\nContent here."
 
     def test_ocr_result_stores_pages_and_raw_markdown(self) -> None:
-        """OcrResult should store list of pages and combined raw markdown."""
+        """OcrResult should store list of pages and combine their markdown."""
         pages = [
             OcrPage(index=0, markdown="Page 1"),
             OcrPage(index=1, markdown="Page 2"),
         ]
-        result = OcrResult(pages=pages, raw_markdown="Page 1\n\nPage 2")
+        result = OcrResult(pages=pages)
 
         assert len(result.pages) == 2
-        assert result.raw_markdown == "Page 1\n\nPage 2"
+        assert result.raw_markdown == "Page 1\n\n---\n\nPage 2"
+
+
+class TestOcrResultFromPages:
+    """Tests for assembling an OcrResult from streamed pages."""
+
+    def test_sorts_pages_by_index(self) -> None:
+        """Pages arriving out of order should be combined in page order."""
+        pages = [
+            OcrPage(index=1, markdown="Page 2"),
+            OcrPage(index=0, markdown="Page 1"),
+        ]
+
+        result = OcrResult.from_pages(pages)
+
+        assert [page.index for page in result.pages] == [0, 1]
+        assert result.raw_markdown == "Page 1\n\n---\n\nPage 2"
+
+    def test_collects_images_from_all_pages(self) -> None:
+        """Image metadata from every page should be gathered in page order."""
+        pages = [
+            OcrPage(index=1, markdown="", images=[ImageMetadata("img-1.jpeg", 20)]),
+            OcrPage(index=0, markdown="", images=[ImageMetadata("img-0.jpeg", 10)]),
+        ]
+
+        result = OcrResult.from_pages(pages)
+
+        assert [image.image_id for image in result.images] == [
+            "img-0.jpeg",
+            "img-1.jpeg",
+        ]
+
+    def test_uses_first_page_dimensions(self) -> None:
+        """Page dimensions should come from the first page that has them."""
+        a4 = PageDimensions(width_mm=210.0, height_mm=297.0)
+        letter = PageDimensions(width_mm=215.9, height_mm=279.4)
+        pages = [
+            OcrPage(index=2, markdown="", dimensions=letter),
+            OcrPage(index=0, markdown=""),
+            OcrPage(index=1, markdown="", dimensions=a4),
+        ]
+
+        assert OcrResult.from_pages(pages).page_dimensions == a4
+
+    def test_no_pages_gives_empty_result(self) -> None:
+        """An empty page list should give an empty result without dimensions."""
+        result = OcrResult.from_pages([])
+
+        assert result.raw_markdown == ""
+        assert result.page_dimensions is None
+
+
+class TestCountPages:
+    """Tests for count_pages function."""
+
+    def test_counts_pages(self, tmp_path: Path) -> None:
+        """Should return the number of pages in the PDF."""
+        writer = PdfWriter()
+        for _ in range(3):
+            writer.add_blank_page(width=595, height=842)
+        pdf_path = tmp_path / "three_pages.pdf"
+        writer.write(pdf_path)
+
+        assert count_pages(pdf_path) == 3
 
 
 class TestCombinePages:
@@ -227,3 +415,123 @@ class TestCombinePages:
 
         assert result == "Only page"
         assert "---" not in result
+
+
+def _ocr_body(page_count: int) -> dict[str, Any]:
+    """Batch OCR response body with the given number of blank pages."""
+    return {
+        "model": "mistral-ocr-latest",
+        "usage_info": {"pages_processed": page_count},
+        "pages": [
+            {
+                "index": index,
+                "markdown": f"Seite {index}",
+                "images": [],
+                "dimensions": None,
+            }
+            for index in range(page_count)
+        ],
+    }
+
+
+class TestExtractPdfsBatch:
+    """Tests for extract_pdfs_batch function."""
+
+    def test_returns_pages_of_each_pdf(self, tmp_path: Path) -> None:
+        """Each PDF should get its pages from the batch job, in page order."""
+        pdf_path = write_blank_pdf(tmp_path / "two.pdf", pages=2)
+        fake = FakeMistral(batch_response=lambda _: _ocr_body(2))
+
+        [result] = asyncio.run(
+            extract_pdfs_batch([pdf_path], fake.client, poll_interval=0)
+        )
+
+        assert [page.markdown for page in result.pages] == ["Seite 0", "Seite 1"]
+        assert fake.files.deleted == ["ocr-1"]
+
+    def test_rejects_more_pages_than_the_pdf_has(self, tmp_path: Path) -> None:
+        """A response with extra pages should raise naming the PDF."""
+        pdf_path = write_blank_pdf(tmp_path / "short.pdf", pages=1)
+        fake = FakeMistral(batch_response=lambda _: _ocr_body(2))
+
+        with pytest.raises(RuntimeError, match=r"2 pages for .*short\.pdf"):
+            asyncio.run(extract_pdfs_batch([pdf_path], fake.client, poll_interval=0))
+
+
+async def _stream(pdf_path: Path, fake: FakeMistral, **kwargs: int) -> list[OcrPage]:
+    return [page async for page in stream_pdf_pages(pdf_path, fake.client, **kwargs)]
+
+
+class TestStreamPdfPages:
+    """Tests for stream_pdf_pages with a fake Mistral client."""
+
+    def test_yields_pages_as_they_complete(self, tmp_path: Path) -> None:
+        """A slow page should not hold back the pages after it."""
+        pdf_path = write_blank_pdf(tmp_path / "three.pdf", pages=3)
+        fake = FakeMistral(ocr_delays={0: 0.04})
+
+        pages = asyncio.run(_stream(pdf_path, fake))
+
+        # Pages 1 and 2 may finish in either order; only page 0 is slow
+        assert sorted(page.index for page in pages) == [0, 1, 2]
+        assert pages[-1].index == 0
+        assert pages[-1].markdown == "Seite 0"
+        assert fake.files.deleted == ["ocr-1"]
+
+    def test_limits_requests_in_flight(self, tmp_path: Path) -> None:
+        """No more than max_concurrency pages should be OCR'd at once."""
+        pdf_path = write_blank_pdf(tmp_path / "five.pdf", pages=5)
+        fake = FakeMistral(ocr_delays=dict.fromkeys(range(5), 0.01))
+
+        asyncio.run(_stream(pdf_path, fake, max_concurrency=2))
+
+        assert sorted(fake.ocr.requests) == [0, 1, 2, 3, 4]
+        assert fake.ocr.max_in_flight == 2
+
+    def test_uses_given_page_count(self, tmp_path: Path) -> None:
+        """A known page count should decide which pages are requested."""
+        pdf_path = write_blank_pdf(tmp_path / "three.pdf", pages=3)
+        fake = FakeMistral()
+
+        asyncio.run(_stream(pdf_path, fake, page_count=2))
+
+        assert sorted(fake.ocr.requests) == [0, 1]
+
+    def test_fully_cached_pdf_is_not_uploaded(self, tmp_path: Path) -> None:
+        """Once every page is cached, streaming again should make no API call."""
+        pdf_path = write_blank_pdf(tmp_path / "two.pdf", pages=2)
+        asyncio.run(_stream(pdf_path, FakeMistral()))
+        fake = FakeMistral()
+
+        pages = asyncio.run(_stream(pdf_path, fake))
+
+        assert sorted(page.markdown for page in pages) == ["Seite 0", "Seite 1"]
+        assert fake.files.uploaded == []
+        assert fake.ocr.requests == []
+
+    def test_requests_only_uncached_pages(self, tmp_path: Path) -> None:
+        """After a failed run, only the pages that were not cached are redone."""
+        pdf_path = write_blank_pdf(tmp_path / "two.pdf", pages=2)
+        failing = FakeMistral(ocr_delays={1: 0.01}, ocr_failing={1})
+        with pytest.raises(RuntimeError):
+            asyncio.run(_stream(pdf_path, failing))
+        fake = FakeMistral()
+
+        pages = asyncio.run(_stream(pdf_path, fake))
+
+        assert [page.index for page in pages] == [0, 1]
+        assert fake.ocr.requests == [1]
+
+    def test_cancels_pending_pages_on_error(self, tmp_path: Path) -> None:
+        """A failing page should raise, cancel the others, and delete the upload."""
+        pdf_path = write_blank_pdf(tmp_path / "three.pdf", pages=3)
+        fake = FakeMistral(ocr_delays={1: 10, 2: 10}, ocr_failing={0})
+
+        async def stream() -> list[int]:
+            with pytest.raises(RuntimeError, match="page 0"):
+                await _stream(pdf_path, fake)
+            await asyncio.sleep(0.01)
+            return sorted(fake.ocr.cancelled)
+
+        assert asyncio.run(stream()) == [1, 2]
+        assert fake.files.deleted == ["ocr-1"]
@@ -0,0 +1,59 @@
+"""Tests for pipeline module."""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pdf_to_english_py.ocr import PAGE_SEPARATOR
+from pdf_to_english_py.pipeline import ocr_and_translate
+from tests.fakes import FakeMistral, write_blank_pdf
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestOcrAndTranslate:
+    """Tests for ocr_and_translate with a fake Mistral client."""
+
+    def test_joins_translated_pages_in_page_order(self, tmp_path: Path) -> None:
+        """Pages OCR'd out of order should still be joined in page order."""
+        pdf_path = write_blank_pdf(tmp_path / "three.pdf", pages=3)
+        fake = FakeMistral(ocr_delays={0: 0.04})
+
+        ocr_result, translated = asyncio.run(ocr_and_translate(pdf_path, fake.client))
+
+        assert [page.index for page in ocr_result.pages] == [0, 1, 2]
+        assert translated == PAGE_SEPARATOR.join(["SEITE 0", "SEITE 1", "SEITE 2"])
+
+    def test_reports_ocr_done_before_translation_ends(self, tmp_path: Path) -> None:
+        """on_ocr_done should be called once, while translation is still running."""
+        pdf_path = write_blank_pdf(tmp_path / "two.pdf", pages=2)
+        fake = FakeMistral(ocr_delays={1: 0.01}, chat_delay=lambda _: 0.05)
+        in_flight_at_ocr_done: list[int] = []
+
+        asyncio.run(
+            ocr_and_translate(
+                pdf_path,
+                fake.client,
+                on_ocr_done=lambda: in_flight_at_ocr_done.append(fake.chat.in_flight),
+            )
+        )
+
+        # Page 0's translation is still running when page 1's OCR completes
+        assert in_flight_at_ocr_done == [1]
+
+    def test_ocr_error_skips_ocr_done(self, tmp_path: Path) -> None:
+        """A failing OCR page should raise without reporting OCR as done."""
+        pdf_path = write_blank_pdf(tmp_path / "two.pdf", pages=2)
+        fake = FakeMistral(ocr_failing={1})
+        ocr_done: list[bool] = []
+
+        with pytest.raises(RuntimeError, match="page 1"):
+            asyncio.run(
+                ocr_and_translate(
+                    pdf_path, fake.client, on_ocr_done=lambda: ocr_done.append(True)
+                )
+            )
+
+        assert ocr_done == []
@@ -2,12 +2,14 @@
 
 from typing import TYPE_CHECKING
 
-from pdf_to_english_py.ocr import ImageMetadata
+from pdf_to_english_py.cache import IMAGE_DIR
+from pdf_to_english_py.ocr import ImageMetadata, page_image_id
 from pdf_to_english_py.render import (
-    generate_image_css,
+    BASE_CSS,
     html_to_pdf,
     markdown_to_html,
     render_pdf,
+    render_pdfs,
     wrap_with_styles,
 )
 
@@ -38,6 +40,20 @@ class TestMarkdownToHtml:
         assert "<p>" in result
         assert "This is a paragraph." in result
 
+    def test_allows_saved_image_file_uri(self) -> None:
+        """Images saved to the OCR image directory should render as <img>."""
+        uri = (IMAGE_DIR / "ab12.jpeg").as_uri()
+
+        result = markdown_to_html(f"![img-0.jpeg]({uri})")
+
+        assert f'<img src="{uri}" alt="img-0.jpeg"' in result
+
+    def test_rejects_other_file_uris(self) -> None:
+        """File URIs outside the OCR image directory should not be linked."""
+        result = markdown_to_html("![secret](file:///etc/passwd)")
+
+        assert "<img" not in result
+
     def test_preserves_embedded_html_table(self) -> None:
         """HTML tables embedded in markdown should pass through unchanged."""
         markdown = """# Title
@@ -117,37 +133,22 @@ class TestWrapWithStyles:
         assert "<body>" in result
         assert "</html>" in result
 
-    def test_includes_css_styles(self) -> None:
-        """Should include CSS styles in the document."""
+    def test_includes_page_css(self) -> None:
+        """Should include the document's @page rule in a style block."""
         html_body = "<p>Content</p>"
 
         result = wrap_with_styles(html_body)
 
         assert "<style>" in result
-        # Should have body styling
-        assert "font-family" in result
-        # Should have table styling
-        assert "border" in result
-
-    def test_table_borders_are_medium_grey(self) -> None:
-        """Table borders should be medium grey (#999) for readability."""
-        html_body = "<p>Content</p>"
-
-        result = wrap_with_styles(html_body)
-
-        assert "#999" in result
-        assert "#333" not in result
+        assert "@page" in result
 
-    def test_italics_use_atkinson_font(self) -> None:
-        """Italic elements should use Atkinson Hyperlegible italic font."""
+    def test_leaves_base_css_to_html_to_pdf(self) -> None:
+        """Shared base styles should not be repeated in every document."""
         html_body = "<p>Content</p>"
 
         result = wrap_with_styles(html_body)
 
-        # Should have @font-face for italic variant
-        assert "font-style: italic" in result
-        # Should NOT fall back to system sans-serif for em/i
-        assert "em, i" not in result or "font-family: sans-serif" not in result
+        assert "@font-face" not in result
 
     def test_preserves_body_content(self) -> None:
         """Body content should be preserved in the output."""
@@ -159,6 +160,27 @@ class TestWrapWithStyles:
         assert "<p>My paragraph.</p>" in result
 
 
+class TestBaseCss:
+    """Tests for the shared BASE_CSS stylesheet."""
+
+    def test_includes_body_and_table_styles(self) -> None:
+        """Should style the body font and table borders."""
+        assert "font-family" in BASE_CSS
+        assert "border" in BASE_CSS
+
+    def test_table_borders_are_medium_grey(self) -> None:
+        """Table borders should be medium grey (#999) for readability."""
+        assert "#999" in BASE_CSS
+        assert "#333" not in BASE_CSS
+
+    def test_italics_use_atkinson_font(self) -> None:
+        """Italic elements should use Atkinson Hyperlegible italic font."""
+        # Should have @font-face for italic variant
+        assert "font-style: italic" in BASE_CSS
+        # Should NOT fall back to system sans-serif for em/i
+        assert "em, i" not in BASE_CSS or "font-family: sans-serif" not in BASE_CSS
+
+
 class TestHtmlToPdf:
     """Tests for html_to_pdf function."""
 
@@ -283,31 +305,76 @@ This document has **bold** and *italic* text.
         assert output_path.stat().st_size > 2000
 
 
-class TestGenerateImageCss:
-    """Tests for generate_image_css function."""
+class TestRenderPdfs:
+    """Tests for rendering several documents in worker processes."""
+
+    def test_renders_each_document_in_order(self, tmp_path: Path) -> None:
+        """Every job should produce its PDF, returned in job order."""
+        paths = [tmp_path / "first.pdf", tmp_path / "second.pdf"]
+
+        result = render_pdfs(
+            [("# First", paths[0], None, None), ("# Second", paths[1], None, None)],
+            max_workers=2,
+        )
+
+        assert result == paths
+        assert all(path.stat().st_size > 0 for path in paths)
+
+    def test_single_document_renders_without_pool(self, tmp_path: Path) -> None:
+        """A single job should still be rendered."""
+        output_path = tmp_path / "only.pdf"
+
+        assert render_pdfs([("# Only", output_path, None, None)]) == [output_path]
+        assert output_path.exists()
+
+
+class TestImageSizing:
+    """Tests for sizing images inline from OCR metadata in markdown_to_html."""
 
-    def test_generates_css_for_single_image(self) -> None:
-        """Should generate CSS rule for a single image."""
-        images = [ImageMetadata(image_id="img-0.jpeg", width_mm=23.8)]
-        css = generate_image_css(images)
+    def test_sizes_image_by_alt_text(self) -> None:
+        """Should give an image with matching metadata an inline width."""
+        images = [ImageMetadata(image_id="img-0.jpeg", width_mm=15.7)]
 
-        assert 'img[alt="img-0.jpeg"]' in css
-        assert "width: 23.8mm;" in css
+        html = markdown_to_html("![img-0.jpeg](img.png)", images=images)
 
-    def test_generates_css_for_multiple_images(self) -> None:
-        """Should generate CSS rules for multiple images."""
+        assert 'alt="img-0.jpeg" style="width: 15.7mm; height: auto;"' in html
+
+    def test_sizes_multiple_images(self) -> None:
+        """Each image should get the width from its own metadata."""
         images = [
             ImageMetadata(image_id="img-0.jpeg", width_mm=7.5),
             ImageMetadata(image_id="img-1.jpeg", width_mm=54.8),
         ]
-        css = generate_image_css(images)
 
-        assert 'img[alt="img-0.jpeg"]' in css
-        assert 'img[alt="img-1.jpeg"]' in css
+        html = markdown_to_html(
+            "![img-0.jpeg](a.png)\n\n![img-1.jpeg](b.png)", images=images
+        )
+
+        assert "width: 7.5mm" in html
+        assert "width: 54.8mm" in html
+
+    def test_sizes_same_image_id_on_different_pages(self) -> None:
+        """Pages that each number an image img-0 should keep their own widths."""
+        first, second = page_image_id(0, "img-0.jpeg"), page_image_id(1, "img-0.jpeg")
+        images = [
+            ImageMetadata(image_id=first, width_mm=7.5),
+            ImageMetadata(image_id=second, width_mm=54.8),
+        ]
+
+        html = markdown_to_html(
+            f"![{first}](a.png)\n\n---\n\n![{second}](b.png)", images=images
+        )
+
+        assert f'alt="{first}" style="width: 7.5mm; height: auto;"' in html
+        assert f'alt="{second}" style="width: 54.8mm; height: auto;"' in html
+
+    def test_leaves_images_without_metadata_unstyled(self) -> None:
+        """Images with no matching metadata should have no style attribute."""
+        images = [ImageMetadata(image_id="img-0.jpeg", width_mm=15.7)]
+
+        html = markdown_to_html("![img-1.jpeg](img.png)", images=images)
 
-    def test_returns_empty_string_for_no_images(self) -> None:
-        """Should return empty string when no images."""
-        assert generate_image_css([]) == ""
+        assert "style=" not in html
 
 
 class TestRenderPdfWithMetadata:
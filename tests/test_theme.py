@@ -42,3 +42,10 @@ class TestPipelineHtml:
 
         assert "error-line" in html
         assert "OCR failed: timeout" in html
+
+    def test_error_message_is_escaped(self) -> None:
+        """Markup in an exception message should be shown, not rendered."""
+        html = pipeline_html(active="ocr", error="OCR failed: <html>502</html>")
+
+        assert "OCR failed: &lt;html&gt;502&lt;/html&gt;" in html
+        assert "<html>" not in html
@@ -1,10 +1,32 @@
 """Tests for translation module."""
 
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
 from pdf_to_english_py.translate import (
+    MAX_CONCURRENT_TRANSLATIONS,
+    TEXT_TRANSLATION_SYSTEM_PROMPT,
     TRANSLATION_SYSTEM_PROMPT,
+    group_segments,
+    has_translatable_text,
+    pack_segments,
+    parse_batch_output,
     restore_images,
+    select_system_prompt,
+    split_segments,
     strip_images,
+    translate_markdown,
+    translate_markdown_batch,
+    translate_page_stream,
+    unpack_segments,
 )
+from tests.fakes import FakeMistral
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
 
 
 class TestTranslationSystemPrompt:
@@ -23,6 +45,33 @@ class TestTranslationSystemPrompt:
         """The prompt should instruct to preserve image references."""
         assert "image" in TRANSLATION_SYSTEM_PROMPT.lower()
 
+    def test_prompt_mentions_segment_markers(self) -> None:
+        """The prompt should instruct to preserve segment markers."""
+        assert "<<<SEG N>>>" in TRANSLATION_SYSTEM_PROMPT
+
+
+class TestSelectSystemPrompt:
+    """Tests for choosing the system prompt from the markdown."""
+
+    def test_uses_full_prompt_for_html_tables(self) -> None:
+        """Markdown containing HTML should get the HTML preservation rules."""
+        markdown = '<table><tr><td colspan="2">Umsatz</td></tr></table>'
+
+        assert select_system_prompt(markdown) == TRANSLATION_SYSTEM_PROMPT
+
+    def test_uses_text_prompt_for_plain_markdown(self) -> None:
+        """Markdown without HTML should get the shorter text prompt."""
+        markdown = "# Titel\n\n![img-0.jpeg](IMG_PLACEHOLDER_0)\n\nWert < 5 und > 2"
+
+        assert select_system_prompt(markdown) == TEXT_TRANSLATION_SYSTEM_PROMPT
+
+    def test_text_prompt_drops_html_rules(self) -> None:
+        """The text prompt should keep every rule except the HTML ones."""
+        assert "HTML" not in TEXT_TRANSLATION_SYSTEM_PROMPT
+        assert "IMG_PLACEHOLDER_N" in TEXT_TRANSLATION_SYSTEM_PROMPT
+        assert "<<<SEG N>>>" in TEXT_TRANSLATION_SYSTEM_PROMPT
+        assert len(TEXT_TRANSLATION_SYSTEM_PROMPT) < len(TRANSLATION_SYSTEM_PROMPT)
+
 
 class TestStripImages:
     """Tests for stripping base64 images before translation."""
@@ -46,6 +95,42 @@ class TestStripImages:
         assert "IMG_PLACEHOLDER_0" in stripped
         assert "IMG_PLACEHOLDER_1" in stripped
 
+    def test_repeated_image_shares_placeholder(self) -> None:
+        """The same image URI appearing twice should map to one placeholder."""
+        markdown = (
+            "![logo](file:///cache/images/ab12.png)\n\n"
+            "![chart](file:///cache/images/cd34.png)\n\n"
+            "![logo](file:///cache/images/ab12.png)"
+        )
+        stripped, images = strip_images(markdown)
+
+        assert stripped == (
+            "![logo](IMG_PLACEHOLDER_0)\n\n"
+            "![chart](IMG_PLACEHOLDER_1)\n\n"
+            "![logo](IMG_PLACEHOLDER_0)"
+        )
+        assert images == {
+            "IMG_PLACEHOLDER_0": "file:///cache/images/ab12.png",
+            "IMG_PLACEHOLDER_1": "file:///cache/images/cd34.png",
+        }
+        assert restore_images(stripped, images) == markdown
+
+    def test_extracts_file_uri_images(self) -> None:
+        """Images saved to disk during OCR should also be replaced."""
+        markdown = "![img-0.jpeg](file:///cache/images/ab12.jpeg)"
+        stripped, images = strip_images(markdown)
+
+        assert stripped == "![img-0.jpeg](IMG_PLACEHOLDER_0)"
+        assert images == {"IMG_PLACEHOLDER_0": "file:///cache/images/ab12.jpeg"}
+
+    def test_ignores_uri_broken_by_whitespace(self) -> None:
+        """A data URI containing whitespace is not a valid image link."""
+        markdown = "![a](data:image/png;base64,AB CD)"
+        stripped, images = strip_images(markdown)
+
+        assert stripped == markdown
+        assert images == {}
+
     def test_preserves_non_base64_images(self) -> None:
         """Should not strip regular URL images."""
         markdown = "![photo](https://example.com/img.png)"
@@ -66,3 +151,352 @@ class TestRestoreImages:
 
         assert "IMG_PLACEHOLDER_0" not in result
         assert "data:image/png;base64,iVBORw0KGgo..." in result
+
+    def test_restores_placeholders_sharing_a_prefix(self) -> None:
+        """IMG_PLACEHOLDER_1 and IMG_PLACEHOLDER_10 should map independently."""
+        translated = "![a](IMG_PLACEHOLDER_1) ![b](IMG_PLACEHOLDER_10)"
+        images = {
+            "IMG_PLACEHOLDER_1": "data:image/png;base64,ONE",
+            "IMG_PLACEHOLDER_10": "data:image/png;base64,TEN",
+        }
+
+        result = restore_images(translated, images)
+
+        assert result == (
+            "![a](data:image/png;base64,ONE) ![b](data:image/png;base64,TEN)"
+        )
+
+    def test_leaves_unknown_placeholders(self) -> None:
+        """Placeholders missing from the mapping should be left unchanged."""
+        translated = "![a](IMG_PLACEHOLDER_3)"
+
+        assert restore_images(translated, {}) == translated
+
+
+class TestPackSegments:
+    """Tests for packing and unpacking translation segments."""
+
+    def test_round_trips_segments(self) -> None:
+        """Unpacking a packed body should return the original segments."""
+        segments = ["# Titre", "Un paragraphe\nsur deux lignes.", "<table></table>"]
+
+        assert unpack_segments(pack_segments(segments), len(segments)) == segments
+
+    def test_numbers_markers_in_order(self) -> None:
+        """Each segment should be introduced by its own numbered marker."""
+        packed = pack_segments(["Un", "Deux"])
+
+        assert packed == "<<<SEG 0>>>\nUn\n\n<<<SEG 1>>>\nDeux"
+
+    def test_strips_whitespace_around_segments(self) -> None:
+        """Extra blank lines added by the model should be removed."""
+        packed = "<<<SEG 0>>>\n\nOne\n\n\n<<<SEG 1>>>\nTwo\n"
+
+        assert unpack_segments(packed, 2) == ["One", "Two"]
+
+    def test_missing_marker_returns_none(self) -> None:
+        """A dropped marker should be reported rather than misaligning segments."""
+        packed = "<<<SEG 0>>>\nOne\n\nTwo"
+
+        assert unpack_segments(packed, 2) is None
+
+    def test_reordered_markers_return_none(self) -> None:
+        """Markers out of order should be reported as a failed round trip."""
+        packed = "<<<SEG 1>>>\nTwo\n\n<<<SEG 0>>>\nOne"
+
+        assert unpack_segments(packed, 2) is None
+
+    def test_empty_segment_returns_none(self) -> None:
+        """A segment translated to nothing should fail the round trip."""
+        packed = "<<<SEG 0>>>\nOne\n\n<<<SEG 1>>>\n\n"
+
+        assert unpack_segments(packed, 2) is None
+
+
+class TestSplitSegments:
+    """Tests for splitting markdown into segments at blank lines."""
+
+    def test_splits_at_blank_lines(self) -> None:
+        """Paragraphs separated by blank lines should become separate segments."""
+        parts = split_segments("Un\n\nDeux\n  \n\nTrois")
+
+        assert parts[::2] == ["Un", "Deux", "Trois"]
+        assert "".join(parts) == "Un\n\nDeux\n  \n\nTrois"
+
+    def test_keeps_fenced_code_block_whole(self) -> None:
+        """A blank line inside a code fence should not split the block."""
+        markdown = "```\ncode\n\nmore code\n```\n\nAprès"
+
+        assert split_segments(markdown)[::2] == [
+            "```\ncode\n\nmore code\n```",
+            "Après",
+        ]
+
+    def test_keeps_html_table_whole(self) -> None:
+        """A blank line inside an HTML table should not split the table."""
+        table = "<table>\n<tr><td>Un</td></tr>\n\n<tr><td>Deux</td></tr>\n</table>"
+
+        assert split_segments(f"{table}\n\nTexte")[::2] == [table, "Texte"]
+
+    def test_tracks_nested_html_blocks(self) -> None:
+        """Only the close of the outermost HTML block should end the segment."""
+        block = "<div>\n<div>Un</div>\n\n<div>Deux</div>\n</div>"
+
+        assert split_segments(f"{block}\n\nTexte")[::2] == [block, "Texte"]
+
+    def test_inline_triple_backticks_do_not_open_fence(self) -> None:
+        """Backticks closed on the same line are inline code, not a fence."""
+        assert split_segments("Voir ```x``` ici\n\nSuite")[::2] == [
+            "Voir ```x``` ici",
+            "Suite",
+        ]
+
+
+class TestGroupSegments:
+    """Tests for grouping segments into packed requests."""
+
+    def test_fills_groups_up_to_limit(self) -> None:
+        """Consecutive segments should share a group while they fit."""
+        groups = group_segments(["aaaa", "bbb", "cc", "d"], max_chars=7)
+
+        assert groups == [["aaaa", "bbb"], ["cc", "d"]]
+
+    def test_oversized_segment_gets_own_group(self) -> None:
+        """A segment longer than the limit should be sent on its own."""
+        groups = group_segments(["a", "x" * 10, "b"], max_chars=5)
+
+        assert groups == [["a"], ["x" * 10], ["b"]]
+
+    def test_no_segments_gives_no_groups(self) -> None:
+        """An empty input should produce no requests."""
+        assert group_segments([], max_chars=5) == []
+
+
+def _batch_record(custom_id: str, content: object) -> str:
+    """Build one line of a Mistral batch output file."""
+    body = {"choices": [{"message": {"role": "assistant", "content": content}}]}
+    return json.dumps(
+        {"custom_id": custom_id, "response": {"status_code": 200, "body": body}}
+    )
+
+
+class TestHasTranslatableText:
+    """Tests for skipping segments with nothing to translate."""
+
+    def test_prose_is_translatable(self) -> None:
+        """A segment with words should be sent for translation."""
+        assert has_translatable_text("## Introduction")
+
+    def test_text_inside_table_is_translatable(self) -> None:
+        """Words in HTML table cells should still be translated."""
+        assert has_translatable_text("<table><tr><td>Prix</td></tr></table>")
+
+    def test_numbers_and_separators_are_not(self) -> None:
+        """Page numbers and rules have no words to translate."""
+        assert not has_translatable_text("12")
+        assert not has_translatable_text("---")
+
+    def test_markup_only_is_not(self) -> None:
+        """Tags, entities, code, URLs and images alone need no translation."""
+        segment = (
+            "<table><tr><td>42</td><td>&nbsp;</td></tr></table> `x = 1` "
+            "https://example.com ![img-0.jpeg](IMG_PLACEHOLDER_0)"
+        )
+        assert not has_translatable_text(segment)
+
+
+class TestParseBatchOutput:
+    """Tests for parsing Mistral batch output files."""
+
+    def test_maps_custom_ids_to_content(self) -> None:
+        """Each output line should map its custom_id to the completion text."""
+        output = "\n".join([_batch_record("1", "Page two"), _batch_record("0", "One")])
+
+        assert parse_batch_output(output) == {"0": "One", "1": "Page two"}
+
+    def test_skips_blank_lines(self) -> None:
+        """Trailing or blank lines in the JSONL should be ignored."""
+        output = _batch_record("0", "Hello") + "\n\n"
+
+        assert parse_batch_output(output) == {"0": "Hello"}
+
+    def test_non_text_content_becomes_empty_string(self) -> None:
+        """Non-string completion content should map to an empty string."""
+        output = _batch_record("0", None)
+
+        assert parse_batch_output(output) == {"0": ""}
+
+
+def _drop_second_marker(text: str) -> str:
+    """Translate like the fake's default, but lose a packed body's SEG 1 marker."""
+    return text.replace("<<<SEG 1>>>\n", "").upper()
+
+
+class TestTranslateMarkdown:
+    """Tests for translate_markdown with a fake Mistral client."""
+
+    def test_packs_segments_into_one_request(self) -> None:
+        """Uncached segments of a page should share a single request."""
+        fake = FakeMistral()
+
+        result = asyncio.run(translate_markdown("Un\n\nDeux", fake.client))
+
+        assert result == "UN\n\nDEUX"
+        assert len(fake.chat.requests) == 1
+
+    def test_falls_back_to_one_request_per_segment(self) -> None:
+        """A reply that loses a segment marker should retry each segment alone."""
+        fake = FakeMistral(translate=_drop_second_marker)
+
+        result = asyncio.run(translate_markdown("Un\n\nDeux", fake.client))
+
+        assert result == "UN\n\nDEUX"
+        assert fake.chat.requests[1:] == ["Un", "Deux"]
+
+    def test_limits_fallback_requests_in_flight(self) -> None:
+        """Retrying each segment alone should stay within the request limit."""
+        fake = FakeMistral(translate=_drop_second_marker, chat_delay=lambda _: 0.01)
+        words = [f"Mot {index}" for index in range(3 * MAX_CONCURRENT_TRANSLATIONS)]
+
+        result = asyncio.run(translate_markdown("\n\n".join(words), fake.client))
+
+        assert result == "\n\n".join(word.upper() for word in words)
+        assert len(fake.chat.requests) == 1 + len(words)
+        assert fake.chat.max_in_flight == MAX_CONCURRENT_TRANSLATIONS
+
+    def test_empty_reply_raises_without_caching(self) -> None:
+        """An empty reply should fail rather than become the cached translation."""
+        refusing = FakeMistral(translate=lambda _: "\n")
+        with pytest.raises(RuntimeError, match="empty translation"):
+            asyncio.run(translate_markdown("Un", refusing.client))
+        fake = FakeMistral()
+
+        result = asyncio.run(translate_markdown("Un", fake.client))
+
+        assert result == "UN"
+        assert fake.chat.requests == ["Un"]
+
+    def test_reuses_cached_segments(self) -> None:
+        """Segments translated before should not be requested again."""
+        fake = FakeMistral()
+        asyncio.run(translate_markdown("Un\n\nDeux", fake.client))
+
+        asyncio.run(translate_markdown("Deux\n\nTrois", fake.client))
+
+        assert fake.chat.requests[-1] == "Trois"
+
+    def test_skips_segments_without_text(self) -> None:
+        """Segments with nothing to translate should make no request."""
+        fake = FakeMistral()
+
+        assert asyncio.run(translate_markdown("42\n\n---", fake.client)) == (
+            "42\n\n---"
+        )
+        assert fake.chat.requests == []
+
+
+def _long_segment(index: int) -> str:
+    """A segment too long to share a packed request with another."""
+    return f"Segment {index} " + "mot " * 2500
+
+
+async def _pages(
+    markdowns: list[str], error: Exception | None = None
+) -> AsyncIterator[tuple[int, str]]:
+    """Yield (index, markdown) pairs, then raise error if given.
+
+    The error comes once the pages' translations are in flight.
+    """
+    for index, markdown in enumerate(markdowns):
+        await asyncio.sleep(0)
+        yield index, markdown
+    if error is not None:
+        await asyncio.sleep(0.01)
+        raise error
+
+
+class TestTranslatePageStream:
+    """Tests for translate_page_stream with a fake Mistral client."""
+
+    def test_yields_pages_as_they_complete(self) -> None:
+        """A slow page should not hold back the translations after it."""
+        fake = FakeMistral(chat_delay=lambda text: 0.04 if text == "Lent" else 0)
+
+        async def translate() -> list[tuple[int, str]]:
+            pages = _pages(["Lent", "Vite", "Aussi"])
+            return [
+                result async for result in translate_page_stream(pages, fake.client)
+            ]
+
+        results = asyncio.run(translate())
+
+        assert results[-1] == (0, "LENT")
+        assert sorted(results) == [(0, "LENT"), (1, "VITE"), (2, "AUSSI")]
+
+    def test_limits_requests_in_flight_across_pages(self) -> None:
+        """No more than max_concurrency requests should run at once, in total."""
+        fake = FakeMistral(chat_delay=lambda _: 0.01)
+        # Each page is two segments too long to share one request
+        markdowns = [
+            f"{_long_segment(2 * index)}\n\n{_long_segment(2 * index + 1)}"
+            for index in range(3)
+        ]
+
+        async def translate() -> None:
+            pages = _pages(markdowns)
+            async for _ in translate_page_stream(pages, fake.client, max_concurrency=2):
+                pass
+
+        asyncio.run(translate())
+
+        assert len(fake.chat.requests) == 6
+        assert fake.chat.max_in_flight == 2
+
+    def test_cancels_pending_translations_when_source_fails(self) -> None:
+        """A failing page source should raise and cancel translations in flight."""
+        fake = FakeMistral(chat_delay=lambda _: 10)
+
+        async def translate() -> int:
+            pages = _pages(["Lent"], error=RuntimeError("OCR failed"))
+            with pytest.raises(RuntimeError, match="OCR failed"):
+                async for _ in translate_page_stream(pages, fake.client):
+                    pass
+            await asyncio.sleep(0.01)
+            return fake.chat.in_flight
+
+        assert asyncio.run(translate()) == 0
+        assert fake.chat.requests == ["Lent"]
+
+
+def _chat_body(content: str) -> dict[str, Any]:
+    """A chat completion response body with the given content."""
+    return {"choices": [{"message": {"content": content}}]}
+
+
+def _upper_body(body: dict[str, Any]) -> dict[str, Any]:
+    """Answer a batch chat request by upper-casing its user message."""
+    return _chat_body(body["messages"][-1]["content"].upper())
+
+
+class TestTranslateMarkdownBatch:
+    """Tests for translate_markdown_batch with a fake Mistral client."""
+
+    def test_packs_pages_of_several_documents_into_one_job(self) -> None:
+        """Pages from different documents should share one job and request."""
+        fake = FakeMistral(batch_response=_upper_body)
+        pages = ["Un", "Deux", "Drei"]
+
+        result = asyncio.run(translate_markdown_batch(pages, fake.client, 0))
+
+        assert result == ["UN", "DEUX", "DREI"]
+        assert len(fake.batch.jobs.requests) == 1
+        assert fake.chat.requests == []
+
+    def test_retries_empty_result_without_caching_it(self) -> None:
+        """An empty batch result should be retried as a regular request."""
+        fake = FakeMistral(batch_response=lambda _: _chat_body(""))
+
+        result = asyncio.run(translate_markdown_batch(["Un"], fake.client, 0))
+
+        assert result == ["UN"]
+        assert fake.chat.requests == ["Un"]
@@ -1,13 +1,42 @@
 """Tests for validation module."""
 
+import asyncio
 import os
+import time
+from typing import TYPE_CHECKING
 
 import pytest
 
 from pdf_to_english_py.validate import (
+    _MAX_CACHED_KEYS,
+    MAX_PDF_PAGES,
+    REJECTION_TTL,
+    VALIDATION_TTL,
+    _loop_clients,
+    _rejected_at,
+    _remember,
+    _seen_within,
+    _validated_at,
+    get_client,
     validate_api_key_format,
     validate_api_key_with_mistral,
+    validate_pdf,
 )
+from tests.fakes import write_blank_pdf
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from mistralai import Mistral
+
+
+@pytest.fixture(autouse=True)
+def _forget_checked_keys() -> Iterator[None]:
+    """Reset remembered keys, so tests cannot rely on order."""
+    yield
+    _validated_at.clear()
+    _rejected_at.clear()
 
 
 class TestValidateApiKeyFormat:
@@ -26,13 +55,176 @@ class TestValidateApiKeyFormat:
         assert validate_api_key_format("some-api-key-123") is True
 
 
+class TestValidatePdf:
+    """Tests for local PDF preflight checks."""
+
+    def test_accepts_small_pdf(self, tmp_path: Path) -> None:
+        """A readable PDF within limits should pass with its page count."""
+        pdf_path = write_blank_pdf(tmp_path / "ok.pdf", pages=2)
+
+        assert validate_pdf(pdf_path) == (True, "", 2)
+
+    def test_rejects_too_many_pages(self, tmp_path: Path) -> None:
+        """A PDF over the page limit should be rejected with its page count."""
+        pdf_path = write_blank_pdf(tmp_path / "long.pdf", pages=MAX_PDF_PAGES + 1)
+
+        is_valid, error_msg, page_count = validate_pdf(pdf_path)
+
+        assert is_valid is False
+        assert str(MAX_PDF_PAGES + 1) in error_msg
+        assert page_count is None
+
+    def test_rejects_unreadable_file(self, tmp_path: Path) -> None:
+        """A file that is not a PDF should be rejected before upload."""
+        pdf_path = tmp_path / "fake.pdf"
+        pdf_path.write_bytes(b"not a pdf")
+
+        is_valid, error_msg, page_count = validate_pdf(pdf_path)
+
+        assert is_valid is False
+        assert "could not read" in error_msg.lower()
+        assert page_count is None
+
+
+async def _get_clients(*api_keys: str) -> list[Mistral]:
+    return [get_client(api_key) for api_key in api_keys]
+
+
+class TestGetClient:
+    """Tests for the shared Mistral client cache."""
+
+    def test_reuses_client_for_same_key(self) -> None:
+        """Repeat calls with one key on one event loop should share a client."""
+        first, second = asyncio.run(_get_clients("key-a", "key-a"))
+
+        assert first is second
+
+    def test_separate_clients_for_different_keys(self) -> None:
+        """Different keys should never share a client."""
+        first, second = asyncio.run(_get_clients("key-a", "key-b"))
+
+        assert first is not second
+
+    def test_separate_clients_for_different_event_loops(self) -> None:
+        """Pooled connections are tied to a loop, so loops should not share."""
+        [first] = asyncio.run(_get_clients("key-a"))
+        [second] = asyncio.run(_get_clients("key-a"))
+
+        assert first is not second
+
+    def test_closes_clients_when_event_loop_shuts_down(self) -> None:
+        """Clients should be closed, and their loop forgotten, after asyncio.run()."""
+        [client] = asyncio.run(_get_clients("key-a"))
+
+        assert client.sdk_configuration.async_client is None
+        assert len(_loop_clients) == 0
+
+    def test_closes_evicted_client(self) -> None:
+        """The least recently used client beyond the cap should be closed."""
+        api_keys = [f"key-{index}" for index in range(_MAX_CACHED_KEYS + 1)]
+
+        async def evict() -> list[bool]:
+            clients = await _get_clients(*api_keys)
+            await asyncio.sleep(0)
+            return [client.sdk_configuration.async_client is None for client in clients]
+
+        assert asyncio.run(evict()) == [True] + [False] * _MAX_CACHED_KEYS
+
+    def test_requires_running_event_loop(self) -> None:
+        """Outside a running loop there is no loop to share a client on."""
+        with pytest.raises(RuntimeError):
+            get_client("key-a")
+
+
+class TestSeenWithin:
+    """Tests for the TTL check on remembered keys, against a fake clock."""
+
+    def test_unseen_key_is_not_seen(self) -> None:
+        """A key never recorded should not count as seen."""
+        assert _seen_within({}, "key-a", ttl=60, now=1000) is False
+
+    def test_key_is_seen_until_ttl_elapses(self) -> None:
+        """A key should count as seen for ttl seconds after it was recorded."""
+        checked_at = {"key-a": 1000.0}
+
+        assert _seen_within(checked_at, "key-a", ttl=60, now=1059.9) is True
+        assert _seen_within(checked_at, "key-a", ttl=60, now=1060) is False
+
+    def test_expired_key_is_forgotten(self) -> None:
+        """An expired entry should be dropped rather than kept around."""
+        checked_at = {"key-a": 1000.0}
+
+        _seen_within(checked_at, "key-a", ttl=60, now=2000)
+
+        assert checked_at == {}
+
+    def test_live_key_becomes_most_recently_used(self) -> None:
+        """A key found live should move to the end of the eviction order."""
+        checked_at = {"key-a": 1000.0, "key-b": 1001.0}
+
+        _seen_within(checked_at, "key-a", ttl=60, now=1010)
+
+        assert list(checked_at) == ["key-b", "key-a"]
+
+
+class TestRemember:
+    """Tests for recording checked keys, against a fake clock."""
+
+    def test_records_time_of_check(self) -> None:
+        """The key should be stored with the time it was checked."""
+        checked_at: dict[str, float] = {}
+
+        _remember(checked_at, "key-a", now=1000)
+
+        assert checked_at == {"key-a": 1000}
+
+    def test_evicts_least_recently_used_beyond_cap(self) -> None:
+        """Past the cap, the least recently used key should be forgotten."""
+        checked_at: dict[str, float] = {}
+        for index in range(_MAX_CACHED_KEYS):
+            _remember(checked_at, f"key-{index}", now=1000 + index)
+        _seen_within(checked_at, "key-0", ttl=60, now=1010)
+
+        _remember(checked_at, "key-new", now=1011)
+
+        assert len(checked_at) == _MAX_CACHED_KEYS
+        assert "key-0" in checked_at
+        assert "key-1" not in checked_at
+
+
 class TestValidateApiKeyWithMistral:
     """Tests for Mistral API key validation."""
 
+    def test_recently_validated_key_skips_api_call(self) -> None:
+        """A key validated within VALIDATION_TTL should pass without a request."""
+        _validated_at["key-a"] = time.monotonic() - VALIDATION_TTL / 2
+
+        is_valid, error_msg, client = asyncio.run(
+            validate_api_key_with_mistral("key-a")
+        )
+
+        assert is_valid is True
+        assert error_msg == ""
+        assert client is not None
+
+    def test_recently_rejected_key_skips_api_call(self) -> None:
+        """A key rejected within REJECTION_TTL should fail without a request."""
+        _rejected_at["key-a"] = time.monotonic() - REJECTION_TTL / 2
+
+        is_valid, error_msg, client = asyncio.run(
+            validate_api_key_with_mistral("key-a")
+        )
+
+        assert is_valid is False
+        assert "invalid api key" in error_msg.lower()
+        assert client is None
+
     @pytest.mark.integration
     def test_invalid_key_returns_false_with_error_message(self) -> None:
         """Invalid API key should return False with an error message."""
-        is_valid, error_msg, client = validate_api_key_with_mistral("invalid-key-12345")
+        is_valid, error_msg, client = asyncio.run(
+            validate_api_key_with_mistral("invalid-key-12345")
+        )
 
         assert is_valid is False
         assert "invalid api key" in error_msg.lower()
@@ -45,8 +237,36 @@ class TestValidateApiKeyWithMistral:
         if not api_key:
             pytest.skip("MISTRAL_API_KEY not set")
 
-        is_valid, error_msg, client = validate_api_key_with_mistral(api_key)
+        is_valid, error_msg, client = asyncio.run(
+            validate_api_key_with_mistral(api_key)
+        )
 
         assert is_valid is True
         assert error_msg == ""
         assert client is not None
+
+    @pytest.mark.integration
+    def test_invalid_key_stays_rejected_on_retry(self) -> None:
+        """An immediate retry of a rejected key should fail the same way."""
+        for _ in range(2):
+            is_valid, error_msg, _ = asyncio.run(
+                validate_api_key_with_mistral("invalid-key-12345")
+            )
+            assert is_valid is False
+            assert "invalid api key" in error_msg.lower()
+
+    @pytest.mark.integration
+    def test_revalidating_valid_key_reuses_client(self) -> None:
+        """A key validated moments ago should pass again with the same client."""
+        api_key = os.environ.get("MISTRAL_API_KEY")
+        if not api_key:
+            pytest.skip("MISTRAL_API_KEY not set")
+
+        async def validate_twice() -> list[tuple[bool | None, str, Mistral | None]]:
+            return [await validate_api_key_with_mistral(api_key) for _ in range(2)]
+
+        (_, _, first), (is_valid, error_msg, second) = asyncio.run(validate_twice())
+
+        assert is_valid is True
+        assert error_msg == ""
+        assert second is first